@@ -6,9 +6,16 @@ Session: session_20251002_180551
 
 import os
 import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 from pathlib import Path
+import sys
+
+# span_trace lives at the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import span_trace
 
 # Paths
 SESSION_DIR = "/Users/shriyavallabh/Desktop/mvp/output/session_20251002_180551"
@@ -16,9 +23,7 @@ INPUT_DIR = f"{SESSION_DIR}/images/status/validated"
 OUTPUT_DIR = f"{SESSION_DIR}/images/status/final"
 ADVISOR_DATA = f"{SESSION_DIR}/reports/advisor-data-summary.json"
 ASSETS_DIR = "/Users/shriyavallabh/Desktop/mvp/assets"
-
-# Ensure output directory exists
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+IMAGES_PER_ADVISOR = 3
 
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
@@ -152,7 +157,79 @@ def apply_branding(image_path, advisor_data, output_path):
         'file_size_kb': round(os.path.getsize(output_path) / 1024, 2)
     }
 
-def main():
+def image_prefixes(advisors, input_dir=INPUT_DIR):
+    """Input image prefix per advisor, in advisor order.
+
+    Images named by advisor ID (ADV001_status_1.png) are preferred. The
+    legacy first-name prefix (shruti_status_1.png) is only used when no
+    other advisor shares it, and two advisors with the same full name would
+    overwrite each other's branded images, so both collisions raise.
+    """
+    first_names = Counter(advisor['name'].split()[0].lower() for advisor in advisors)
+    full_names = Counter(advisor['name'].lower() for advisor in advisors)
+    prefixes = []
+    collisions = []
+    for advisor in advisors:
+        if full_names[advisor['name'].lower()] > 1:
+            collisions.append(f"{advisor['id']} ({advisor['name']}): duplicate name")
+            continue
+        if any(os.path.exists(f"{input_dir}/{advisor['id']}_status_{i}.png")
+               for i in range(1, IMAGES_PER_ADVISOR + 1)):
+            prefixes.append(advisor['id'])
+            continue
+        first_name = advisor['name'].split()[0].lower()
+        if first_names[first_name] > 1:
+            collisions.append(f"{advisor['id']} ({advisor['name']}): shared prefix '{first_name}', "
+                              f"name its images {advisor['id']}_status_N.png")
+        prefixes.append(first_name)
+
+    if collisions:
+        raise ValueError("Ambiguous advisor images:\n  " + "\n  ".join(collisions))
+    return prefixes
+
+def brand_advisor_images(advisor_key, advisor_data, input_dir=INPUT_DIR, output_dir=OUTPUT_DIR):
+    """Brand every status image of one advisor (runs in a pool worker)"""
+    with span_trace.span("brand_advisor_images", cat="brand", advisor=advisor_key):
+        return _brand_advisor_images(advisor_key, advisor_data, input_dir, output_dir)
+
+def _brand_advisor_images(advisor_key, advisor_data, input_dir, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    log = [
+        f"\nProcessing images for: {advisor_data['name']}",
+        f"  ARN: {advisor_data['arn']}",
+        f"  Brand Color: {advisor_data['branding']['primaryColor']}",
+        f"  Tagline: {advisor_data['branding']['tagline']}"
+    ]
+
+    for i in range(1, IMAGES_PER_ADVISOR + 1):
+        input_file = f"{input_dir}/{advisor_key}_status_{i}.png"
+
+        if not os.path.exists(input_file):
+            log.append(f"  ⚠️  Missing: {os.path.basename(input_file)}")
+            continue
+
+        # Generate output filename
+        advisor_name_file = advisor_data['name'].lower().replace(' ', '_')
+        output_file = f"{output_dir}/{advisor_name_file}_status_{i}_branded.png"
+
+        # Apply branding
+        try:
+            result = apply_branding(input_file, advisor_data, output_file)
+            results.append(result)
+            log.append(f"  ✓ Branded: {os.path.basename(output_file)} ({result['file_size_kb']} KB)")
+        except Exception as e:
+            log.append(f"  ✗ Error: {os.path.basename(input_file)} - {str(e)}")
+            results.append({
+                'input': os.path.basename(input_file),
+                'output': None,
+                'advisor': advisor_data['name'],
+                'error': str(e)
+            })
+
+    return results, log
+
+def main(workers=None):
     """Process all images with branding"""
 
     print("=" * 80)
@@ -163,48 +240,21 @@ def main():
     with open(ADVISOR_DATA, 'r') as f:
         data = json.load(f)
 
-    advisors = {
-        'shruti': data['advisors'][0],  # Shruti Petkar
-        'vidyadhar': data['advisors'][1],  # Vidyadhar Petkar
-        'shriya': data['advisors'][2],  # Shriya Vallabh Petkar
-        'avalok': data['advisors'][3]  # Avalok Langer
-    }
+    # Input images are named by advisor ID, or by first name in older sessions
+    advisors = data['advisors']
+    prefixes = image_prefixes(advisors)
+    total_expected = len(advisors) * IMAGES_PER_ADVISOR
 
-    # Process all images
+    # Process all images, one advisor per pool task
     results = []
-    total_processed = 0
-
-    for advisor_key, advisor_data in advisors.items():
-        print(f"\nProcessing images for: {advisor_data['name']}")
-        print(f"  ARN: {advisor_data['arn']}")
-        print(f"  Brand Color: {advisor_data['branding']['primaryColor']}")
-        print(f"  Tagline: {advisor_data['branding']['tagline']}")
-
-        for i in range(1, 4):
-            input_file = f"{INPUT_DIR}/{advisor_key}_status_{i}.png"
-
-            if not os.path.exists(input_file):
-                print(f"  ⚠️  Missing: {os.path.basename(input_file)}")
-                continue
-
-            # Generate output filename
-            advisor_name_file = advisor_data['name'].lower().replace(' ', '_')
-            output_file = f"{OUTPUT_DIR}/{advisor_name_file}_status_{i}_branded.png"
-
-            # Apply branding
-            try:
-                result = apply_branding(input_file, advisor_data, output_file)
-                results.append(result)
-                total_processed += 1
-                print(f"  ✓ Branded: {os.path.basename(output_file)} ({result['file_size_kb']} KB)")
-            except Exception as e:
-                print(f"  ✗ Error: {os.path.basename(input_file)} - {str(e)}")
-                results.append({
-                    'input': os.path.basename(input_file),
-                    'output': None,
-                    'advisor': advisor_data['name'],
-                    'error': str(e)
-                })
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        advisor_results = pool.map(brand_advisor_images, prefixes, advisors)
+        for shard_results, log in advisor_results:
+            print("\n".join(log))
+            results.extend(shard_results)
+
+    total_processed = len([r for r in results if r.get('output')])
 
     # Generate summary report
     summary = {
@@ -212,8 +262,8 @@ def main():
         'timestamp': datetime.now().isoformat(),
         'agent': 'brand-customizer',
         'total_images_processed': total_processed,
-        'total_images_expected': 12,
-        'success_rate': f"{(total_processed / 12) * 100:.1f}%",
+        'total_images_expected': total_expected,
+        'success_rate': f"{(total_processed / total_expected) * 100:.1f}%" if total_expected else "0.0%",
         'branding_elements_applied': {
             'advisor_logo': '150x150px, bottom-left, 40px margin',
             'tagline': 'Montserrat-style Bold 32pt, top banner',
@@ -229,12 +279,12 @@ def main():
                 'tagline': adv['branding']['tagline'],
                 'arn': adv['arn']
             }
-            for adv in advisors.values()
+            for adv in advisors
         ],
         'detailed_results': results,
         'output_directory': OUTPUT_DIR,
         'validation': {
-            'all_images_branded': total_processed == 12,
+            'all_images_branded': total_processed == total_expected,
             'consistent_dimensions': '1080x1920 (9:16 portrait)',
             'file_format': 'PNG with optimization',
             'quality_settings': 'quality=95, optimized=True'
@@ -249,7 +299,7 @@ def main():
     print("\n" + "=" * 80)
     print("BRANDING SUMMARY")
     print("=" * 80)
-    print(f"Total Images Processed: {total_processed}/12")
+    print(f"Total Images Processed: {total_processed}/{total_expected}")
     print(f"Success Rate: {summary['success_rate']}")
     print(f"Output Directory: {OUTPUT_DIR}")
     print(f"Summary Report: {summary_path}")
@@ -266,7 +316,7 @@ def main():
         f.write(f"**Timestamp**: {datetime.now().isoformat()}\n")
         f.write(f"**Agent**: brand-customizer\n\n")
         f.write(f"## Summary\n\n")
-        f.write(f"- **Images Processed**: {total_processed}/12\n")
+        f.write(f"- **Images Processed**: {total_processed}/{total_expected}\n")
         f.write(f"- **Success Rate**: {summary['success_rate']}\n")
         f.write(f"- **Output Directory**: {OUTPUT_DIR}\n\n")
         f.write(f"## Branding Elements Applied\n\n")
@@ -275,7 +325,7 @@ def main():
         f.write(f"\n## Advisors Processed\n\n")
         for adv in summary['advisors_processed']:
             f.write(f"### {adv['name']}\n")
-            f.write(f"- Images Branded: {adv['images_branded']}/3\n")
+            f.write(f"- Images Branded: {adv['images_branded']}/{IMAGES_PER_ADVISOR}\n")
             f.write(f"- Brand Color: {adv['brand_color']}\n")
             f.write(f"- Tagline: {adv['tagline']}\n")
             f.write(f"- ARN: {adv['arn']}\n\n")
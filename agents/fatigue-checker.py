@@ -4,17 +4,762 @@ Fatigue Checker Agent - Content Freshness & Diversity Analysis
 Prevents audience fatigue through semantic analysis and pattern detection
 """
 
+import argparse
 import json
 import os
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from datetime import date, datetime, timedelta
 from collections import Counter, defaultdict
+import hashlib
+import math
+import random
 import re
+import sqlite3
+import struct
+import sys
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # optional: TF-IDF batch mode falls back to pure Python
+    np = None
+
+try:
+    from scipy import sparse
+except ImportError:  # optional: dense NumPy (or pure Python) TF-IDF instead
+    sparse = None
+
+# span_trace and session_status live at the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import span_trace
+from session_status import session_is_live
+
+OUTPUT_ROOT = '/Users/shriyavallabh/Desktop/mvp/output'
+HISTORY_INDEX_PATH = '/Users/shriyavallabh/Desktop/mvp/data/fatigue-history.db'
+
+CHANNELS = ['linkedin', 'whatsapp']
+HISTORY_SUBDIRS = ['branded', 'json']
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'is', 'are', 'was', 'were', 'your', 'you', 'this', 'that'
+})
+
+# Keyword tables for the single-pass matcher (order is report order)
+TOPIC_KEYWORDS = {
+    'gold': ['gold', 'सोना', '$'],
+    'sip': ['sip', 'systematic', 'monthly'],
+    'fii': ['fii', 'foreign', 'outflow'],
+    'market': ['sensex', 'nifty', 'market'],
+    'ipo': ['ipo', 'public offer'],
+    'rate_cut': ['rate cut', 'rbi', 'dovish'],
+    'tax': ['tax', 'ltcg', 'harvesting'],
+    'portfolio': ['portfolio', 'diversification', 'allocation'],
+    'it_sector': ['it sector', 'tech', 'tcs'],
+    'banking': ['banking', 'hdfc', 'bank']
+}
+# Checked in priority order: the first emotion present wins
+EMOTION_KEYWORDS = {
+    'fear': ['mistake', 'loss', 'panic', 'fear'],
+    'aspiration': ['opportunity', 'win', 'success', 'growth'],
+    'urgency': ['fomo', 'missing', 'too late', 'rush'],
+    'education': ['learn', 'understand', 'explain', 'framework']
+}
+MARKET_REFS = ['sensex', 'nifty', 'gold', 'fii', 'dii', 'sip', 'inflation', 'gdp']
+
+# Bounded repeats keep per-match work constant on long or adversarial text
+CURRENCY_PATTERN = re.compile(
+    r'[₹$]\s{0,3}[\d,]{1,24}(?:\.\d{1,6})?(?:\s{0,3}(?:crore|cr|lakhs|lakh|billion|trillion|L|K)\b)?',
+    re.IGNORECASE
+)
+PERCENTAGE_PATTERN = re.compile(r'\d+(?:\.\d+)?%')
+HOOK_ID_PATTERN = re.compile(r'\bVH\d{3}\b')
+
+
+def as_text(text):
+    """Coerce content fields (sometimes dicts or numbers) to a string"""
+    if isinstance(text, dict):
+        return json.dumps(text)
+    if not isinstance(text, str):
+        return str(text)
+    return text
+
+
+def content_hash(text):
+    """Stable key for a piece of content"""
+    return hashlib.blake2b(as_text(text).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def content_tokens(text):
+    """Normalized word set used for similarity: lowercased, minus stop words"""
+    return frozenset(re.findall(r'\w+', as_text(text).lower())) - STOP_WORDS
+
+
+def jaccard(tokens1, tokens2):
+    """Exact Jaccard similarity of two token sets"""
+    if not tokens1 or not tokens2:
+        return 0.0
+    return len(tokens1 & tokens2) / len(tokens1 | tokens2)
+
+
+class KeywordMatcher:
+    """Finds every labelled keyword in a text with one regex scan.
+
+    All keywords are compiled into a single trie-shaped pattern inside a
+    lookahead, so the lowered text is scanned once and overlapping matches
+    are kept. Each keyword also carries the labels of keywords that are its
+    prefixes, giving the same answers as one substring test per keyword.
+    """
+
+    def __init__(self, groups):
+        # groups: {kind: {label: [keywords]}}
+        self.kinds = list(groups)
+        self.order = {kind: list(labels) for kind, labels in groups.items()}
+        self.labels = defaultdict(set)
+        for kind, labels in groups.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    self.labels[keyword.lower()].add((kind, label))
+        for keyword in list(self.labels):
+            for prefix in list(self.labels):
+                if prefix != keyword and keyword.startswith(prefix):
+                    self.labels[keyword] |= self.labels[prefix]
+        self.pattern = re.compile('(?=(' + self._trie_pattern(sorted(self.labels)) + '))')
+
+    @classmethod
+    def _trie_pattern(cls, keywords):
+        """Alternation grouped by shared prefix, preferring the longest match"""
+        branches = []
+        by_first = defaultdict(list)
+        for keyword in keywords:
+            by_first[keyword[0]].append(keyword[1:])
+        for first, rests in by_first.items():
+            tails = [rest for rest in rests if rest]
+            branch = re.escape(first)
+            if tails:
+                inner = cls._trie_pattern(tails)
+                branch += f'(?:{inner})' + ('?' if len(tails) < len(rests) else '')
+            branches.append(branch)
+        return '|'.join(branches)
+
+    def scan(self, text):
+        """{kind: [labels]} present in text, in table order"""
+        found = set()
+        for keyword in set(self.pattern.findall(as_text(text).lower())):
+            found |= self.labels[keyword]
+        return {
+            kind: [label for label in self.order[kind] if (kind, label) in found]
+            for kind in self.kinds
+        }
+
+
+FATIGUE_MATCHER = KeywordMatcher({
+    'topic': TOPIC_KEYWORDS,
+    'emotion': EMOTION_KEYWORDS,
+    'market_ref': {ref: [ref] for ref in MARKET_REFS}
+})
+
+
+@lru_cache(maxsize=4096)
+def _scan_cached(text):
+    return FATIGUE_MATCHER.scan(text)
+
+
+def scan_content(text):
+    """Topics, emotions and market references of one piece of content"""
+    return _scan_cached(as_text(text))
+
+
+def numeric_data_points(text):
+    """Currency amounts and percentages quoted in content"""
+    text = as_text(text)
+    return CURRENCY_PATTERN.findall(text) + PERCENTAGE_PATTERN.findall(text)
+
+
+def usage_entries(text, hook=None, content_type=None, hook_id=None):
+    """(kind, value) pairs recorded in the usage timeline for one item"""
+    entries = set()
+    if content_type:
+        entries.add(('topic', content_type))
+    entries.update(('topic', topic) for topic in scan_content(text)['topic'])
+    if hook_id:
+        entries.add(('hook', hook_id))
+    if isinstance(hook, str):
+        entries.update(('hook', match) for match in HOOK_ID_PATTERN.findall(hook))
+    entries.update(
+        ('data_point', ' '.join(point.split()).lower()) for point in numeric_data_points(text)
+    )
+    return entries
+
+
+class MinHasher:
+    """MinHash signatures for estimating Jaccard similarity.
+
+    The standard error of an estimate is about 1/sqrt(num_perm), so the
+    number of permutations is derived from the tolerated error. Signatures
+    use one-permutation hashing: each token is hashed once and kept as the
+    minimum of its bin, and empty bins borrow from a fixed pseudo-random
+    probe sequence (optimal densification). This costs O(tokens + num_perm)
+    instead of O(tokens * num_perm). Token hashes are stable across
+    processes and runs.
+    """
+
+    def __init__(self, error=0.10, seed=42):
+        self.num_perm = max(16, math.ceil(1 / error ** 2))
+        self.salt = seed.to_bytes(8, 'big')
+        # Identifies the signature scheme for cached signatures
+        self.key = f"oph{self.num_perm}:{seed}"
+        rng = random.Random(seed)
+        self.probes = [
+            [rng.randrange(self.num_perm) for _ in range(32)]
+            for _ in range(self.num_perm)
+        ]
+
+    def signature(self, tokens):
+        """Signature tuple for a token set, or None for an empty set"""
+        if not tokens:
+            return None
+        bins = [None] * self.num_perm
+        for token in tokens:
+            h = int.from_bytes(
+                hashlib.blake2b(token.encode('utf-8'), digest_size=8, salt=self.salt).digest(), 'big'
+            )
+            b = h % self.num_perm
+            if bins[b] is None or h < bins[b]:
+                bins[b] = h
+        filled = [b for b in range(self.num_perm) if bins[b] is not None]
+        signature = list(bins)
+        for b in range(self.num_perm):
+            if bins[b] is None:
+                donor = next((p for p in self.probes[b] if bins[p] is not None), None)
+                signature[b] = bins[donor if donor is not None else filled[b % len(filled)]]
+        return tuple(signature)
+
+    @staticmethod
+    def estimate(sig1, sig2):
+        """Estimated Jaccard similarity of two signatures"""
+        if sig1 is None or sig2 is None:
+            return 0.0
+        return sum(x == y for x, y in zip(sig1, sig2)) / len(sig1)
+
+
+def tfidf_best_matches(current_texts, historical_texts):
+    """Best TF-IDF cosine similarity of each current text against the history.
+
+    Vectors are built over the combined corpus (smoothed IDF, L2
+    normalized) and the whole current x history similarity matrix is
+    computed in one sparse product when SciPy/NumPy are installed.
+    """
+    if not current_texts or not historical_texts:
+        return [0.0] * len(current_texts)
+
+    docs = [
+        Counter(word for word in re.findall(r'\w+', as_text(text).lower()) if word not in STOP_WORDS)
+        for text in list(current_texts) + list(historical_texts)
+    ]
+    vocabulary = {}
+    document_frequency = Counter()
+    for doc in docs:
+        for word in doc:
+            vocabulary.setdefault(word, len(vocabulary))
+        document_frequency.update(doc.keys())
+
+    n_docs = len(docs)
+    idf = {word: math.log((1 + n_docs) / (1 + df)) + 1 for word, df in document_frequency.items()}
+
+    # Sparse rows: (column indices, L2-normalized tf-idf weights)
+    rows = []
+    for doc in docs:
+        weights = {vocabulary[word]: count * idf[word] for word, count in doc.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        rows.append((list(weights.keys()), [w / norm for w in weights.values()]))
+
+    n_current = len(current_texts)
+    if np is not None:
+        if sparse is not None:
+            indptr = np.cumsum([0] + [len(cols) for cols, _ in rows])
+            indices = np.fromiter((c for cols, _ in rows for c in cols), dtype=np.int64, count=indptr[-1])
+            data = np.fromiter((v for _, vals in rows for v in vals), dtype=np.float64, count=indptr[-1])
+            matrix = sparse.csr_matrix((data, indices, indptr), shape=(n_docs, len(vocabulary)))
+            similarity = (matrix[:n_current] @ matrix[n_current:].T).toarray()
+        else:
+            matrix = np.zeros((n_docs, len(vocabulary)))
+            for i, (cols, vals) in enumerate(rows):
+                matrix[i, cols] = vals
+            similarity = matrix[:n_current] @ matrix[n_current:].T
+        return similarity.max(axis=1).tolist()
+
+    historical_rows = [dict(zip(cols, vals)) for cols, vals in rows[n_current:]]
+    best = []
+    for cols, vals in rows[:n_current]:
+        best.append(max(
+            sum(v * hist.get(c, 0.0) for c, v in zip(cols, vals))
+            for hist in historical_rows
+        ))
+    return best
+
+
+class FingerprintCache:
+    """Token sets and MinHash signatures computed once per content hash.
+
+    Fingerprints are kept in memory and persisted in the history index
+    database, so a historical item is tokenized once ever rather than
+    once per comparison per run.
+    """
+
+    def __init__(self, conn, minhasher):
+        self.conn = conn
+        self.minhasher = minhasher
+        # Signatures are only valid for the permutations that produced them
+        self.minhash_key = minhasher.key
+        self.memory = {}
+        self.pending = []
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    content_hash TEXT PRIMARY KEY,
+                    tokens TEXT NOT NULL,
+                    minhash_key TEXT NOT NULL,
+                    signature BLOB
+                )
+            """)
+
+    def prefetch(self, hashes):
+        """Load stored fingerprints for many content hashes in a few queries"""
+        missing = [h for h in set(hashes) if h not in self.memory]
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            rows = self.conn.execute(f"""
+                SELECT content_hash, tokens, signature FROM fingerprints
+                WHERE minhash_key = ? AND content_hash IN ({','.join('?' * len(chunk))})
+            """, [self.minhash_key] + chunk).fetchall()
+            for key, tokens, signature in rows:
+                self.memory[key] = self.decode(tokens, signature)
+
+    def decode(self, tokens, signature):
+        """Fingerprint from its stored (tokens, packed signature) columns"""
+        return (
+            frozenset(tokens.split()),
+            struct.unpack(f'>{self.minhasher.num_perm}Q', signature) if signature else None
+        )
+
+    def get(self, text, key=None):
+        """(tokens, signature) for a piece of content"""
+        key = key or content_hash(text)
+        fingerprint = self.memory.get(key)
+        if fingerprint is None:
+            self.prefetch([key])
+            fingerprint = self.memory.get(key)
+        if fingerprint is None:
+            tokens = content_tokens(text)
+            fingerprint = (tokens, self.minhasher.signature(tokens))
+            self.memory[key] = fingerprint
+            self.pending.append(key)
+        return fingerprint
+
+    def tokens(self, text, key=None):
+        return self.get(text, key)[0]
+
+    def of(self, item):
+        """(tokens, signature) for a content item or HistoryRecord"""
+        if isinstance(item, HistoryRecord):
+            if item.fingerprint is None:
+                item.fingerprint = self.get(item.text, item.content_hash)
+            return item.fingerprint
+        return self.get(item.get('content', '') or item.get('text', ''), item.get('content_hash'))
+
+    def flush(self):
+        """Persist fingerprints computed since the last flush"""
+        if not self.pending:
+            return
+        rows = []
+        for key in self.pending:
+            tokens, signature = self.memory[key]
+            packed = struct.pack(f'>{len(signature)}Q', *signature) if signature else None
+            rows.append((key, ' '.join(sorted(tokens)), self.minhash_key, packed))
+        with self.conn:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO fingerprints (content_hash, tokens, minhash_key, signature)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+        self.pending = []
+
+
+class LSHIndex:
+    """Banded locality-sensitive hashing over MinHash signatures.
+
+    Items sharing any band bucket with a query become candidates, so a
+    lookup touches only a few buckets instead of the whole history. Bands
+    are sized so that a pair at the similarity threshold is a candidate
+    with probability of at least min_recall.
+    """
+
+    def __init__(self, num_perm, threshold, min_recall=0.99):
+        self.rows = 1
+        for rows in range(1, num_perm + 1):
+            bands = num_perm // rows
+            if 1 - (1 - threshold ** rows) ** bands >= min_recall:
+                self.rows = rows
+        self.bands = num_perm // self.rows
+        self.buckets = [defaultdict(list) for _ in range(self.bands)]
+
+    def band_keys(self, sig):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows]
+
+    def insert(self, key, sig):
+        if sig is None:
+            return
+        for band, band_key in self.band_keys(sig):
+            self.buckets[band][band_key].append(key)
+
+    def query(self, sig):
+        """Keys of every item sharing at least one band with sig"""
+        candidates = set()
+        if sig is None:
+            return candidates
+        for band, band_key in self.band_keys(sig):
+            candidates.update(self.buckets[band].get(band_key, ()))
+        return candidates
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size"""
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+    def groups(self):
+        members = defaultdict(list)
+        for x in range(len(self.parent)):
+            members[self.find(x)].append(x)
+        return [group for group in members.values() if len(group) > 1]
+
+
+class HistoryRecord:
+    """One past item, holding only the fields fatigue checks read.
+
+    Supports the read-only dict access (get, [] and in) used on current
+    content, so the same checks run over both.
+    """
+
+    __slots__ = ('advisor_id', 'text', 'hook', 'type', 'timestamp', 'content_hash', 'fingerprint')
+
+    FIELDS = {
+        'advisorId': 'advisor_id', 'content': 'text', 'text': 'text', 'hook': 'hook',
+        'type': 'type', 'timestamp': 'timestamp', 'content_hash': 'content_hash'
+    }
+
+    def __init__(self, advisor_id, text, hook, type, timestamp, content_hash, fingerprint=None):
+        self.advisor_id = advisor_id
+        self.text = text
+        self.hook = hook
+        self.type = type
+        self.timestamp = timestamp
+        self.content_hash = content_hash
+        self.fingerprint = fingerprint
+
+    def get(self, key, default=None):
+        attr = self.FIELDS.get(key)
+        value = getattr(self, attr) if attr else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key):
+        attr = self.FIELDS.get(key)
+        return attr is not None and getattr(self, attr) is not None
+
+
+def parse_session_date(session_name, session_path):
+    """Date a session ran, from its directory name or else its mtime"""
+    name = session_name[len('session_'):] if session_name.startswith('session_') else session_name
+
+    # session_<epoch seconds> / session_<epoch milliseconds>
+    if re.fullmatch(r'\d{10}', name):
+        return datetime.fromtimestamp(int(name)).date()
+    if re.fullmatch(r'\d{13}', name):
+        return datetime.fromtimestamp(int(name) / 1000).date()
+
+    # session_2025-09-17T12-40-09-000Z and variants
+    match = re.match(r'(\d{4})-(\d{2})-(\d{2})T', name)
+    if match:
+        return datetime(*map(int, match.groups())).date()
+
+    # session_20251002_180551
+    match = re.match(r'(\d{4})(\d{2})(\d{2})_\d{6}', name)
+    if match:
+        return datetime(*map(int, match.groups())).date()
+
+    return datetime.fromtimestamp(os.path.getmtime(session_path)).date()
+
+
+def history_since(config):
+    """Oldest date a fatigue check reads: its history window or a rotation window"""
+    days = max(config.get('history_window_days', 30), config.get('topic_rotation_days', 14),
+               config.get('data_reuse_days', 14))
+    return datetime.now().date() - timedelta(days=days)
+
+
+class HistoryIndex:
+    """On-disk index of past content keyed by (advisor, channel, date).
+
+    Sessions are indexed when their fatigue check completes, or by sync()
+    for sessions that never ran one, and re-indexed when their content files
+    change, so a fatigue check queries only the history window instead of
+    re-reading every session directory under output/.
+    """
+
+    def __init__(self, db_path=HISTORY_INDEX_PATH, output_root=OUTPUT_ROOT):
+        self.db_path = db_path
+        self.output_root = output_root
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS history_items (
+                    session_id TEXT NOT NULL,
+                    channel TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    advisor_id TEXT NOT NULL,
+                    content_date TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    hook TEXT,
+                    type TEXT,
+                    content_hash TEXT,
+                    PRIMARY KEY (session_id, channel, item_key)
+                )
+            """)
+            # Indexes created before fingerprints were stored lack the column
+            columns = {row[1] for row in self.conn.execute('PRAGMA table_info(history_items)')}
+            if 'content_hash' not in columns:
+                self.conn.execute('ALTER TABLE history_items ADD COLUMN content_hash TEXT')
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_history_window
+                ON history_items (advisor_id, channel, content_date)
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS indexed_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    content_date TEXT NOT NULL,
+                    indexed_at TEXT NOT NULL,
+                    source_mtime REAL
+                )
+            """)
+            # Sessions indexed before change tracking are re-indexed once
+            columns = {row[1] for row in self.conn.execute('PRAGMA table_info(indexed_sessions)')}
+            if 'source_mtime' not in columns:
+                self.conn.execute('ALTER TABLE indexed_sessions ADD COLUMN source_mtime REAL')
+            # When each topic / hook ID / data point was used, per advisor
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS usage_timeline (
+                    advisor_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    used_date TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    PRIMARY KEY (advisor_id, kind, value, session_id)
+                )
+            """)
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_usage_last
+                ON usage_timeline (advisor_id, kind, value, used_date)
+            """)
+            # Sessions indexed before the timeline existed
+            if (self.conn.execute('SELECT 1 FROM history_items LIMIT 1').fetchone()
+                    and not self.conn.execute('SELECT 1 FROM usage_timeline LIMIT 1').fetchone()):
+                rows = self.conn.execute(
+                    'SELECT session_id, advisor_id, content_date, text, hook, type FROM history_items'
+                ).fetchall()
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO usage_timeline VALUES (?, ?, ?, ?, ?)',
+                    [(advisor_id, kind, value, content_date, session_id)
+                     for session_id, advisor_id, content_date, text, hook, content_type in rows
+                     for kind, value in usage_entries(text, hook, content_type)]
+                )
+
+    def read_session_items(self, session_path):
+        """Yield (channel, item_key, data) for every advisor item in a session"""
+        for channel in CHANNELS:
+            for subdir in HISTORY_SUBDIRS:
+                full_path = os.path.join(session_path, channel, subdir)
+                if not os.path.isdir(full_path):
+                    continue
+                for file in sorted(os.listdir(full_path)):
+                    if not file.endswith('.json'):
+                        continue
+                    try:
+                        with open(os.path.join(full_path, file), 'r') as f:
+                            data = json.load(f)
+                    except (OSError, ValueError):
+                        continue
+                    if isinstance(data, dict) and data.get('advisorId'):
+                        yield channel, f"{subdir}/{file}", data
+
+    def source_mtime(self, session_path, files=True):
+        """Newest mtime of the directories (and files) read_session_items reads"""
+        newest = 0.0
+        for channel in CHANNELS:
+            for subdir in HISTORY_SUBDIRS:
+                full_path = os.path.join(session_path, channel, subdir)
+                try:
+                    newest = max(newest, os.stat(full_path).st_mtime)
+                    if not files:
+                        continue
+                    with os.scandir(full_path) as entries:
+                        for entry in entries:
+                            if entry.name.endswith('.json'):
+                                newest = max(newest, entry.stat().st_mtime)
+                except OSError:
+                    continue
+        return newest
+
+    def index_session(self, session_id):
+        """(Re)index one session directory; replaces any earlier rows for it"""
+        session_path = os.path.join(self.output_root, session_id)
+        if not os.path.isdir(session_path):
+            return 0
+
+        # Taken before reading, so files written meanwhile trigger a re-index
+        source_mtime = self.source_mtime(session_path)
+        content_date = parse_session_date(session_id, session_path).isoformat()
+        rows = []
+        timeline = set()
+        for channel, item_key, data in self.read_session_items(session_path):
+            text = data.get('content', '') or data.get('text', '')
+            if not isinstance(text, str):
+                text = json.dumps(text) if isinstance(text, dict) else str(text)
+            hook = data.get('hook') or data.get('viralHook')
+            rows.append((
+                session_id, channel, item_key, data.get('advisorId'), content_date, text,
+                hook, data.get('type'), content_hash(text)
+            ))
+            hook_id = data.get('hookId') or data.get('viralHookId')
+            timeline.update(
+                (data.get('advisorId'), kind, value, content_date, session_id)
+                for kind, value in usage_entries(text, hook, data.get('type'), hook_id)
+            )
+
+        with self.conn:
+            self.conn.execute('DELETE FROM history_items WHERE session_id = ?', (session_id,))
+            self.conn.executemany("""
+                INSERT INTO history_items
+                (session_id, channel, item_key, advisor_id, content_date, text, hook, type, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.conn.execute('DELETE FROM usage_timeline WHERE session_id = ?', (session_id,))
+            self.conn.executemany('INSERT INTO usage_timeline VALUES (?, ?, ?, ?, ?)', sorted(timeline))
+            self.conn.execute("""
+                INSERT OR REPLACE INTO indexed_sessions (session_id, content_date, indexed_at, source_mtime)
+                VALUES (?, ?, ?, ?)
+            """, (session_id, content_date, datetime.now().isoformat(), source_mtime))
+        return len(rows)
+
+    def sync(self, exclude_session=None, since_date=None):
+        """Index new session directories and re-index ones changed since.
+
+        Sessions dated before since_date (from their ID) cannot reach the
+        history window and are not read. An indexed session counts as changed
+        when a content directory is newer than at indexing, i.e. files were
+        added, removed or replaced, so checking it costs a few directory stats.
+        Sessions another pipeline is still writing are left for a later sync.
+        """
+        indexed = dict(self.conn.execute('SELECT session_id, source_mtime FROM indexed_sessions'))
+        for session_id in sorted(os.listdir(self.output_root)):
+            session_path = os.path.join(self.output_root, session_id)
+            if session_id == exclude_session:
+                continue
+            if since_date is not None and parse_session_date(session_id, session_path) < since_date:
+                continue
+            indexed_mtime = indexed.get(session_id)
+            if indexed_mtime is not None and self.source_mtime(session_path, files=False) <= indexed_mtime:
+                continue
+            if not os.path.isdir(session_path) or session_is_live(session_path):
+                continue
+            self.index_session(session_id)
+
+    def last_used(self, advisor_id, kind, values, exclude_session=None):
+        """{value: date last used} for an advisor, one index seek per value"""
+        values = sorted(set(values))
+        last = {}
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            rows = self.conn.execute(f"""
+                SELECT value, MAX(used_date) FROM usage_timeline
+                WHERE advisor_id = ? AND kind = ? AND value IN ({','.join('?' * len(chunk))})
+                AND session_id != ?
+                GROUP BY value
+            """, [advisor_id, kind] + chunk + [exclude_session or '']).fetchall()
+            last.update((value, date.fromisoformat(used_date)) for value, used_date in rows)
+        return last
+
+    def used_within(self, advisor_id, kind, values, days, exclude_session=None):
+        """{value: date} for values last used within the past `days` days"""
+        cutoff_date = datetime.now().date() - timedelta(days=days)
+        return {
+            value: used_date
+            for value, used_date in self.last_used(advisor_id, kind, values, exclude_session).items()
+            if used_date >= cutoff_date
+        }
+
+    def iter_records(self, advisor_id, channel, since_date, exclude_session=None, fingerprints=None):
+        """Yield an advisor's HistoryRecords on a channel since since_date, newest first.
+
+        Rows are streamed from the cursor. With a FingerprintCache, stored
+        fingerprints are joined in and shared through its memory.
+        """
+        params = [advisor_id, channel, since_date.isoformat(), exclude_session or '']
+        if fingerprints is not None:
+            sql = """
+                SELECT h.content_date, h.text, h.hook, h.type, h.content_hash, f.tokens, f.signature
+                FROM history_items h
+                LEFT JOIN fingerprints f ON f.content_hash = h.content_hash AND f.minhash_key = ?
+            """
+            params.insert(0, fingerprints.minhash_key)
+        else:
+            sql = """
+                SELECT h.content_date, h.text, h.hook, h.type, h.content_hash, NULL, NULL
+                FROM history_items h
+            """
+        sql += """
+            WHERE h.advisor_id = ? AND h.channel = ? AND h.content_date >= ? AND h.session_id != ?
+            ORDER BY h.content_date DESC, h.session_id DESC, h.item_key
+        """
+        for content_date, text, hook, content_type, key, tokens, signature in self.conn.execute(sql, params):
+            key = key or content_hash(text)
+            fingerprint = None
+            if fingerprints is not None:
+                fingerprint = fingerprints.memory.get(key)
+                if fingerprint is None and tokens is not None:
+                    fingerprint = fingerprints.memory[key] = fingerprints.decode(tokens, signature)
+            yield HistoryRecord(advisor_id, text, hook, content_type, content_date, key, fingerprint)
+
+
 class FatigueChecker:
-    def __init__(self, session_id, config=None):
+    def __init__(self, session_id, config=None, output_root=OUTPUT_ROOT):
         self.session_id = session_id
-        self.session_dir = f"/Users/shriyavallabh/Desktop/mvp/output/{session_id}"
+        self.session_dir = os.path.join(output_root, session_id)
         self.config = config or self.load_default_config()
 
         # Analysis thresholds
@@ -22,6 +767,13 @@ class FatigueChecker:
         self.topic_rotation_days = self.config.get('topic_rotation_days', 14)
         self.history_window_days = self.config.get('history_window_days', 30)
 
+        # Indexed history of past sessions
+        self.history_index = HistoryIndex(output_root=output_root)
+
+        # Near-duplicate search against the full history window
+        self.minhasher = MinHasher(error=self.config.get('similarity_error', 0.10))
+        self.fingerprints = FingerprintCache(self.history_index.conn, self.minhasher)
+
         # Results
         self.analysis_results = {
             'session_id': session_id,
@@ -33,14 +785,18 @@ class FatigueChecker:
             'distribution_status': 'PENDING'
         }
 
-    def load_default_config(self):
+    @staticmethod
+    def load_default_config():
         """Load default configuration"""
         return {
             'similarity_threshold': 0.70,
             'topic_rotation_days': 14,
             'history_window_days': 30,
             'topic_frequency_threshold': 0.40,
-            'data_reuse_days': 14
+            'data_reuse_days': 14,
+            'similarity_error': 0.10,
+            'similarity_method': 'jaccard',
+            'tfidf_threshold': 0.70
         }
 
     def load_current_content(self):
@@ -76,68 +832,107 @@ class FatigueChecker:
 
         return content
 
-    def load_historical_content(self):
-        """Load historical content from previous sessions"""
-        historical = {
-            'linkedin': {},
-            'whatsapp': {}
-        }
-
-        output_dir = '/Users/shriyavallabh/Desktop/mvp/output'
-        cutoff_date = datetime.now() - timedelta(days=self.history_window_days)
+    def check_rotation(self, current_set):
+        """Flags for topics, hook IDs and data points reused inside their rotation window"""
+        used = defaultdict(set)
+        advisor_id = None
+        for item in current_set:
+            advisor_id = advisor_id or item.get('advisorId')
+            text = item.get('content', '') or item.get('text', '')
+            entries = usage_entries(
+                text, item.get('hook') or item.get('viralHook'), item.get('type'),
+                item.get('hookId') or item.get('viralHookId')
+            )
+            for kind, value in entries:
+                used[kind].add(value)
+        if not advisor_id:
+            return []
 
-        # Find all session directories
-        for session_dir in os.listdir(output_dir):
-            session_path = os.path.join(output_dir, session_dir)
-            if not os.path.isdir(session_path) or session_dir == self.session_id:
+        flags = []
+        data_reuse_days = self.config.get('data_reuse_days', 14)
+        recent_topics = self.history_index.used_within(
+            advisor_id, 'topic', used['topic'], self.topic_rotation_days, self.session_id
+        )
+        if used['topic'] and len(recent_topics) / len(used['topic']) > self.config.get('topic_frequency_threshold', 0.40):
+            flags.append({
+                'type': 'topic_rotation',
+                'severity': 'medium',
+                'details': f"Used within {self.topic_rotation_days} days: {', '.join(sorted(recent_topics))}"
+            })
+        recent_hooks = self.history_index.used_within(
+            advisor_id, 'hook', used['hook'], self.topic_rotation_days, self.session_id
+        )
+        if recent_hooks:
+            flags.append({
+                'type': 'hook_rotation',
+                'severity': 'medium',
+                'details': f"Hooks used within {self.topic_rotation_days} days: {', '.join(sorted(recent_hooks))}"
+            })
+        recent_points = self.history_index.used_within(
+            advisor_id, 'data_point', used['data_point'], data_reuse_days, self.session_id
+        )
+        if recent_points:
+            flags.append({
+                'type': 'data_point_rotation',
+                'severity': 'low',
+                'details': f"Data points used within {data_reuse_days} days: {', '.join(sorted(recent_points))}"
+            })
+        return flags
+
+    def find_cross_advisor_duplicates(self, current_content):
+        """Cluster near-identical current items shared by different advisors.
+
+        Identical texts are grouped by content hash; the rest meet through
+        LSH buckets, and candidates already in the same cluster are skipped,
+        so large duplicate groups cost near-linear time rather than all pairs.
+        """
+        clusters = []
+        for channel in CHANNELS:
+            items = [
+                (advisor_id, item)
+                for advisor_id in sorted(a for a in current_content[channel] if a)
+                for item in current_content[channel][advisor_id]
+            ]
+            if len(items) < 2:
                 continue
 
-            # Try to extract date from session directory
-            try:
-                # Skip sessions that are too old (basic heuristic)
-                if session_dir.startswith('session_20250'):
-                    # Parse date if possible
-                    pass
-
-                # Load LinkedIn
-                linkedin_dir = os.path.join(session_path, 'linkedin')
-                for subdir in ['branded', 'json']:
-                    full_path = os.path.join(linkedin_dir, subdir)
-                    if os.path.exists(full_path):
-                        for file in os.listdir(full_path):
-                            if file.endswith('.json'):
-                                try:
-                                    with open(os.path.join(full_path, file), 'r') as f:
-                                        data = json.load(f)
-                                        if isinstance(data, dict) and 'advisorId' in data:
-                                            advisor_id = data.get('advisorId')
-                                            if advisor_id not in historical['linkedin']:
-                                                historical['linkedin'][advisor_id] = []
-                                            historical['linkedin'][advisor_id].append(data)
-                                except:
-                                    pass
-
-                # Load WhatsApp
-                whatsapp_dir = os.path.join(session_path, 'whatsapp')
-                for subdir in ['branded', 'json']:
-                    full_path = os.path.join(whatsapp_dir, subdir)
-                    if os.path.exists(full_path):
-                        for file in os.listdir(full_path):
-                            if file.endswith('.json'):
-                                try:
-                                    with open(os.path.join(full_path, file), 'r') as f:
-                                        data = json.load(f)
-                                        if isinstance(data, dict) and 'advisorId' in data:
-                                            advisor_id = data.get('advisorId')
-                                            if advisor_id not in historical['whatsapp']:
-                                                historical['whatsapp'][advisor_id] = []
-                                            historical['whatsapp'][advisor_id].append(data)
-                                except:
-                                    pass
-            except Exception as e:
-                continue
+            sets = UnionFind(len(items))
+            lsh = LSHIndex(self.minhasher.num_perm, self.similarity_threshold)
+            first_by_hash = {}
+            unique = []  # (item index, tokens)
+            for idx, (_, item) in enumerate(items):
+                text = as_text(item.get('content', '') or item.get('text', ''))
+                key = content_hash(text)
+                if key in first_by_hash:
+                    sets.union(first_by_hash[key], idx)
+                    continue
+                first_by_hash[key] = idx
+                tokens, signature = self.fingerprints.get(text, key)
+                for candidate in lsh.query(signature):
+                    other_idx, other_tokens = unique[candidate]
+                    if sets.find(other_idx) != sets.find(idx) and jaccard(tokens, other_tokens) > self.similarity_threshold:
+                        sets.union(other_idx, idx)
+                lsh.insert(len(unique), signature)
+                unique.append((idx, tokens))
+
+            for group in sets.groups():
+                advisors = sorted({items[idx][0] for idx in group})
+                if len(advisors) < 2:
+                    continue
+                preview = as_text(items[group[0]][1].get('content', '') or items[group[0]][1].get('text', ''))
+                clusters.append({
+                    'channel': channel,
+                    'advisors': advisors,
+                    'item_count': len(group),
+                    'preview': ' '.join(preview.split())[:100]
+                })
+        self.fingerprints.flush()
 
-        return historical
+        clusters.sort(key=lambda c: (c['channel'], -c['item_count'], c['advisors']))
+        return {
+            'clusters': clusters,
+            'duplicate_items': sum(c['item_count'] for c in clusters)
+        }
 
     def extract_topics(self, content_list):
         """Extract topics from content"""
@@ -147,96 +942,32 @@ class FatigueChecker:
             if 'type' in content:
                 topics.append(content.get('type', 'unknown'))
 
-            # Extract from content text
+            # Common financial topics (TOPIC_KEYWORDS) from content text
             text = content.get('content', '') or content.get('text', '')
-
-            # Ensure text is a string
-            if isinstance(text, dict):
-                text = json.dumps(text)
-            elif not isinstance(text, str):
-                text = str(text)
-
-            # Common financial topics
-            topic_keywords = {
-                'gold': ['gold', 'सोना', '$'],
-                'sip': ['sip', 'systematic', 'monthly'],
-                'fii': ['fii', 'foreign', 'outflow'],
-                'market': ['sensex', 'nifty', 'market'],
-                'ipo': ['ipo', 'public offer'],
-                'rate_cut': ['rate cut', 'rbi', 'dovish'],
-                'tax': ['tax', 'ltcg', 'harvesting'],
-                'portfolio': ['portfolio', 'diversification', 'allocation'],
-                'it_sector': ['it sector', 'tech', 'tcs'],
-                'banking': ['banking', 'hdfc', 'bank']
-            }
-
-            text_lower = text.lower()
-            for topic, keywords in topic_keywords.items():
-                if any(kw in text_lower for kw in keywords):
-                    topics.append(topic)
+            topics.extend(scan_content(text)['topic'])
 
         return topics
 
     def calculate_semantic_similarity(self, text1, text2):
         """Simple semantic similarity using word overlap"""
-        # Ensure texts are strings
-        if isinstance(text1, dict):
-            text1 = json.dumps(text1)
-        elif not isinstance(text1, str):
-            text1 = str(text1)
-
-        if isinstance(text2, dict):
-            text2 = json.dumps(text2)
-        elif not isinstance(text2, str):
-            text2 = str(text2)
-
-        # Normalize texts
-        words1 = set(re.findall(r'\w+', text1.lower()))
-        words2 = set(re.findall(r'\w+', text2.lower()))
-
-        # Remove common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                     'of', 'with', 'is', 'are', 'was', 'were', 'your', 'you', 'this', 'that'}
-        words1 = words1 - stop_words
-        words2 = words2 - stop_words
-
-        # Calculate Jaccard similarity
-        if not words1 or not words2:
-            return 0.0
-
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-
-        return intersection / union if union > 0 else 0.0
+        return jaccard(self.fingerprints.tokens(text1), self.fingerprints.tokens(text2))
 
     def extract_data_points(self, text):
         """Extract numerical data points and market references"""
         data_points = []
 
-        # Ensure text is a string
-        if isinstance(text, dict):
-            text = json.dumps(text)
-        elif not isinstance(text, str):
-            text = str(text)
-
-        # Extract numbers with currency
-        currency_pattern = r'[₹$]\s*[\d,]+(?:\.\d+)?(?:\s*(?:cr|crore|lakh|lakhs|L|K|billion|trillion))?'
-        data_points.extend(re.findall(currency_pattern, text, re.IGNORECASE))
+        text = as_text(text)
 
-        # Extract percentages
-        percentage_pattern = r'\d+(?:\.\d+)?%'
-        data_points.extend(re.findall(percentage_pattern, text))
+        # Extract numbers with currency, and percentages
+        data_points.extend(numeric_data_points(text))
 
-        # Extract specific market references
-        market_refs = ['sensex', 'nifty', 'gold', 'fii', 'dii', 'sip', 'inflation', 'gdp']
-        for ref in market_refs:
-            if ref in text.lower():
-                data_points.append(ref)
+        # Extract specific market references (MARKET_REFS)
+        data_points.extend(scan_content(text)['market_ref'])
 
         return data_points
 
-    def analyze_advisor_content(self, advisor_id, current_content, historical_content):
-        """Analyze content freshness for a single advisor"""
+    def analyze_advisor_content(self, advisor_id, current_content, since_date):
+        """Analyze content freshness for a single advisor against its history since since_date"""
         analysis = {
             'advisor_id': advisor_id,
             'freshness_score': 0,
@@ -248,9 +979,11 @@ class FatigueChecker:
 
         # Analyze LinkedIn posts
         current_linkedin = current_content['linkedin'].get(advisor_id, [])
-        historical_linkedin = historical_content['linkedin'].get(advisor_id, [])
 
         if current_linkedin:
+            historical_linkedin = list(self.history_index.iter_records(
+                advisor_id, 'linkedin', since_date, self.session_id, self.fingerprints
+            ))
             linkedin_score, linkedin_flags = self.analyze_content_set(
                 current_linkedin, historical_linkedin, 'linkedin'
             )
@@ -262,9 +995,11 @@ class FatigueChecker:
 
         # Analyze WhatsApp messages
         current_whatsapp = current_content['whatsapp'].get(advisor_id, [])
-        historical_whatsapp = historical_content['whatsapp'].get(advisor_id, [])
 
         if current_whatsapp:
+            historical_whatsapp = list(self.history_index.iter_records(
+                advisor_id, 'whatsapp', since_date, self.session_id, self.fingerprints
+            ))
             whatsapp_score, whatsapp_flags = self.analyze_content_set(
                 current_whatsapp, historical_whatsapp, 'whatsapp'
             )
@@ -302,6 +1037,46 @@ class FatigueChecker:
 
         return analysis
 
+    def find_similar_content(self, current_set, historical_set):
+        """Highest similarity above threshold for each current item that has one.
+
+        With similarity_method 'tfidf' the whole set is scored as one TF-IDF
+        cosine matrix (catches reworded posts); otherwise Jaccard via LSH.
+        """
+        if self.config.get('similarity_method') == 'tfidf':
+            threshold = self.config.get('tfidf_threshold', self.similarity_threshold)
+            best_matches = tfidf_best_matches(
+                [item.get('content', '') or item.get('text', '') for item in current_set],
+                [item.get('content', '') or item.get('text', '') for item in historical_set]
+            )
+            return [similarity for similarity in best_matches if similarity > threshold]
+        return self.find_similar_jaccard(current_set, historical_set)
+
+    def find_similar_jaccard(self, current_set, historical_set):
+        """Highest Jaccard similarity above threshold per current item.
+
+        Historical items are bucketed with LSH, so each current item is
+        compared only with its candidates rather than the whole history.
+        Candidates are confirmed with exact Jaccard, so reported values
+        match calculate_semantic_similarity.
+        """
+        lsh = LSHIndex(self.minhasher.num_perm, self.similarity_threshold)
+        historical_tokens = []
+        for idx, historical_item in enumerate(historical_set):
+            tokens, signature = self.fingerprints.of(historical_item)
+            historical_tokens.append(tokens)
+            lsh.insert(idx, signature)
+
+        similarities = []
+        for current_item in current_set:
+            tokens, signature = self.fingerprints.get(current_item.get('content', '') or current_item.get('text', ''))
+            candidates = lsh.query(signature)
+            best = max((jaccard(tokens, historical_tokens[idx]) for idx in candidates), default=0.0)
+            if best > self.similarity_threshold:
+                similarities.append(best)  # One flag per current content
+        self.fingerprints.flush()
+        return similarities
+
     def analyze_content_set(self, current_set, historical_set, content_type):
         """Analyze a set of content (LinkedIn or WhatsApp)"""
         score = 10.0
@@ -321,23 +1096,14 @@ class FatigueChecker:
                     'details': f"Topic overlap: {topic_overlap:.1%} (threshold: 40%)"
                 })
 
-        # 2. Content Similarity Check
-        for current_item in current_set:
-            current_text = current_item.get('content', '') or current_item.get('text', '')
-
-            for historical_item in historical_set[:10]:
-                historical_text = historical_item.get('content', '') or historical_item.get('text', '')
-
-                similarity = self.calculate_semantic_similarity(current_text, historical_text)
-
-                if similarity > self.similarity_threshold:
-                    score -= 1.5
-                    flags.append({
-                        'type': 'content_similarity',
-                        'severity': 'critical' if similarity > 0.85 else 'high',
-                        'details': f"Similarity: {similarity:.1%} with recent content"
-                    })
-                    break  # One flag per current content
+        # 2. Content Similarity Check (whole history window, via MinHash LSH)
+        for similarity in self.find_similar_content(current_set, historical_set):
+            score -= 1.5
+            flags.append({
+                'type': 'content_similarity',
+                'severity': 'critical' if similarity > 0.85 else 'high',
+                'details': f"Similarity: {similarity:.1%} with recent content"
+            })
 
         # 3. Data Point Reuse Check
         current_data_points = []
@@ -377,15 +1143,10 @@ class FatigueChecker:
         for item in current_set:
             text = item.get('content', '') or item.get('text', '')
 
-            # Simple emotion detection
-            if any(word in text.lower() for word in ['mistake', 'loss', 'panic', 'fear']):
-                emotions.append('fear')
-            elif any(word in text.lower() for word in ['opportunity', 'win', 'success', 'growth']):
-                emotions.append('aspiration')
-            elif any(word in text.lower() for word in ['fomo', 'missing', 'too late', 'rush']):
-                emotions.append('urgency')
-            elif any(word in text.lower() for word in ['learn', 'understand', 'explain', 'framework']):
-                emotions.append('education')
+            # Simple emotion detection (first match in EMOTION_KEYWORDS order)
+            detected = scan_content(text)['emotion']
+            if detected:
+                emotions.append(detected[0])
 
         if emotions:
             emotion_counts = Counter(emotions)
@@ -399,21 +1160,59 @@ class FatigueChecker:
                     'details': f"Dominant emotion at {max_emotion_freq:.1%}"
                 })
 
+        # 6. Rotation windows (usage timeline, dated across all history)
+        for flag in self.check_rotation(current_set):
+            score -= 0.5
+            flags.append(flag)
+
         return max(0, score), flags
 
-    def generate_report(self):
+    def analyze_advisors(self, advisor_ids, current_content, sync=True):
+        """Analyses for a group of advisors, reading one advisor's history at a time"""
+        with span_trace.span("fatigue.analyze_advisors", cat="fatigue", advisors=len(advisor_ids)):
+            # Pick up sessions that finished without a fatigue check
+            if sync:
+                self.history_index.sync(exclude_session=self.session_id, since_date=history_since(self.config))
+            cutoff_date = (datetime.now() - timedelta(days=self.history_window_days)).date()
+            return {
+                advisor_id: self.analyze_advisor_content(advisor_id, current_content, cutoff_date)
+                for advisor_id in advisor_ids
+            }
+
+    def generate_report(self, workers=1):
         """Generate comprehensive fatigue report"""
         current_content = self.load_current_content()
-        historical_content = self.load_historical_content()
 
         # Get all advisor IDs
         all_advisors = set()
         all_advisors.update(current_content['linkedin'].keys())
         all_advisors.update(current_content['whatsapp'].keys())
+        all_advisors = sorted(all_advisors)
+
+        if workers > 1 and len(all_advisors) > 1:
+            # Sync once here; each worker then reads its own shard's history
+            self.history_index.sync(exclude_session=self.session_id, since_date=history_since(self.config))
+            shards = [all_advisors[i::workers] for i in range(min(workers, len(all_advisors)))]
+            analyses = {}
+            with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+                futures = [
+                    pool.submit(
+                        analyze_advisor_shard, self.session_id, self.config, shard,
+                        {channel: {a: current_content[channel].get(a, []) for a in shard}
+                         for channel in CHANNELS}
+                    )
+                    for shard in shards
+                ]
+                for future in futures:
+                    analyses.update(future.result())
+        else:
+            analyses = self.analyze_advisors(all_advisors, current_content)
+
+        self.analysis_results['cross_advisor'] = self.find_cross_advisor_duplicates(current_content)
 
-        # Analyze each advisor
-        for advisor_id in sorted(all_advisors):
-            analysis = self.analyze_advisor_content(advisor_id, current_content, historical_content)
+        # Aggregate in sorted advisor order so reports don't depend on workers
+        for advisor_id in all_advisors:
+            analysis = analyses[advisor_id]
             self.analysis_results['advisors'][advisor_id] = analysis
 
             # Count approved/flagged
@@ -452,9 +1251,13 @@ class FatigueChecker:
         with open(md_path, 'w') as f:
             self.write_markdown_report(f)
 
+        # Session complete: add its content to the history index
+        indexed = self.history_index.index_session(self.session_id)
+
         print(f"✓ Fatigue analysis saved:")
         print(f"  JSON: {json_path}")
         print(f"  Report: {md_path}")
+        print(f"  History index: {indexed} items from this session")
 
     def write_markdown_report(self, f):
         """Write markdown format report"""
@@ -507,6 +1310,22 @@ class FatigueChecker:
 
             f.write(f"\n---\n\n")
 
+        # Cross-advisor duplicates
+        cross_advisor = self.analysis_results.get('cross_advisor', {})
+        f.write(f"## Cross-Advisor Duplicates\n\n")
+        if cross_advisor.get('clusters'):
+            f.write(f"{len(cross_advisor['clusters'])} clusters, {cross_advisor['duplicate_items']} items "
+                    f"shared across advisors (similarity > {self.similarity_threshold:.0%}):\n\n")
+            for cluster in cross_advisor['clusters']:
+                f.write(f"- **{cluster['channel']}** ({cluster['item_count']} items): "
+                        f"{', '.join(cluster['advisors'])}\n")
+                f.write(f"  > {cluster['preview']}\n")
+            f.write(f"\n")
+        else:
+            f.write(f"No near-identical content shared across advisors.\n\n")
+
+        f.write(f"---\n\n")
+
         # Overall recommendations
         f.write(f"## Overall Recommendations\n\n")
 
@@ -527,11 +1346,127 @@ class FatigueChecker:
         f.write(f"- **Analysis Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
 
+class FatigueGate:
+    """Per-candidate fatigue verdicts for generators, before any branding.
+
+    Recent history is loaded once into an in-memory inverted index
+    (advisor, channel) -> token -> items, so check() computes exact Jaccard
+    against every overlapping item from posting counts alone. Accepted
+    candidates are added to the index so a run does not repeat itself.
+    """
+
+    def __init__(self, session_id=None, config=None, history_index=None):
+        self.session_id = session_id
+        self.config = config or FatigueChecker.load_default_config()
+        self.similarity_threshold = self.config.get('similarity_threshold', 0.70)
+        self.topic_rotation_days = self.config.get('topic_rotation_days', 14)
+        self.history_index = history_index or HistoryIndex()
+
+        self.postings = defaultdict(lambda: defaultdict(list))
+        self.sizes = []
+        self.hooks = defaultdict(dict)  # advisor -> hook -> last used date
+        self.types = defaultdict(dict)  # advisor -> type -> last used date
+        self.load()
+
+    def load(self):
+        """Warm the index with the history window of every advisor"""
+        self.history_index.sync(exclude_session=self.session_id, since_date=history_since(self.config))
+        advisor_ids = [row[0] for row in self.history_index.conn.execute(
+            'SELECT DISTINCT advisor_id FROM history_items'
+        )]
+        cutoff_date = datetime.now().date() - timedelta(days=self.config.get('history_window_days', 30))
+        fingerprints = FingerprintCache(
+            self.history_index.conn, MinHasher(error=self.config.get('similarity_error', 0.10))
+        )
+        for channel in CHANNELS:
+            for advisor_id in advisor_ids:
+                for record in self.history_index.iter_records(
+                        advisor_id, channel, cutoff_date, self.session_id, fingerprints):
+                    tokens = fingerprints.of(record)[0]
+                    self.add(advisor_id, channel, tokens, record.hook, record.type,
+                             date.fromisoformat(record.timestamp))
+        fingerprints.flush()
+
+    def add(self, advisor_id, channel, tokens, hook=None, content_type=None, used_date=None):
+        used_date = used_date or datetime.now().date()
+        idx = len(self.sizes)
+        self.sizes.append(len(tokens))
+        postings = self.postings[(advisor_id, channel)]
+        for token in tokens:
+            postings[token].append(idx)
+        if hook:
+            last = self.hooks[advisor_id].get(hook)
+            self.hooks[advisor_id][hook] = max(last, used_date) if last else used_date
+        if content_type:
+            last = self.types[advisor_id].get(content_type)
+            self.types[advisor_id][content_type] = max(last, used_date) if last else used_date
+
+    def check(self, advisor_id, text, hook=None, type=None, channel=None):
+        """Verdict for one candidate: {'approved', 'similarity', 'flags'}.
+
+        channel limits the similarity search to one channel (default: all).
+        Flags use the same shape as the session report.
+        """
+        tokens = content_tokens(text)
+        overlap = Counter()
+        for ch in ([channel] if channel else CHANNELS):
+            postings = self.postings.get((advisor_id, ch))
+            if postings:
+                for token in tokens:
+                    overlap.update(postings.get(token, ()))
+        similarity = max(
+            (count / (len(tokens) + self.sizes[idx] - count) for idx, count in overlap.items()),
+            default=0.0
+        )
+
+        flags = []
+        if similarity > self.similarity_threshold:
+            flags.append({
+                'type': 'content_similarity',
+                'severity': 'critical' if similarity > 0.85 else 'high',
+                'details': f"Similarity: {similarity:.1%} with recent content"
+            })
+        rotation_cutoff = datetime.now().date() - timedelta(days=self.topic_rotation_days)
+        last_hook = self.hooks.get(advisor_id, {}).get(hook) if hook else None
+        if last_hook and last_hook >= rotation_cutoff:
+            flags.append({
+                'type': 'hook_repetition',
+                'severity': 'high',
+                'details': f"Hook already used on {last_hook.isoformat()}"
+            })
+        last_type = self.types.get(advisor_id, {}).get(type) if type else None
+        if last_type and last_type >= rotation_cutoff:
+            flags.append({
+                'type': 'topic_repetition',
+                'severity': 'medium',
+                'details': f"'{type}' content already used on {last_type.isoformat()}"
+            })
+
+        return {
+            'approved': not any(flag['severity'] in ('critical', 'high') for flag in flags),
+            'similarity': similarity,
+            'flags': flags
+        }
+
+    def accept(self, advisor_id, text, hook=None, type=None, channel='linkedin'):
+        """Record a candidate the generator kept, so later ones are checked against it"""
+        self.add(advisor_id, channel, content_tokens(text), hook, type)
+
+
+def analyze_advisor_shard(session_id, config, advisor_ids, current_content):
+    """Process-pool worker: analyse a shard of advisors in a fresh checker"""
+    checker = FatigueChecker(session_id, config)
+    return checker.analyze_advisors(advisor_ids, current_content, sync=False)
+
+
 def main():
     """Main execution"""
-    import sys
-
-    session_id = sys.argv[1] if len(sys.argv) > 1 else 'session_1759798367'
+    parser = argparse.ArgumentParser(description='Check content fatigue for a session')
+    parser.add_argument('session_id', nargs='?', default='session_1759798367')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes for per-advisor analysis (default: 1)')
+    args = parser.parse_args()
+    session_id = args.session_id
 
     print(f"🔍 Fatigue Checker Agent")
     print(f"Session: {session_id}")
@@ -540,7 +1475,7 @@ def main():
     checker = FatigueChecker(session_id)
 
     print(f"\n📊 Analyzing content freshness...")
-    results = checker.generate_report()
+    results = checker.generate_report(workers=max(1, args.workers))
 
     print(f"\n📈 Results:")
     print(f"  Overall Score: {results['overall_score']:.1f}/10")
@@ -6,8 +6,11 @@ Generates personalized viral posts for each advisor using proven formulas
 
 import json
 import os
+import re
 from datetime import datetime
 
+import sebi_compliance as sebi
+
 # Viral formula scores calculation
 def calculate_virality_score(hook_strength, story_power, emotion_level, specificity, simplicity, cta_strength):
     """
@@ -1912,15 +1915,33 @@ Mutual fund investments are subject to market risks. Read all scheme-related doc
 
     return posts
 
+# Drop drafts that would fail SEBI validation before anything is written
+def compliant_posts(posts):
+    approved = []
+    for post in posts:
+        blocking = sebi.blocking_issues(sebi.check(post["content"], "linkedin", post["postId"]))
+        if blocking:
+            print(f"✗ Rejected {post['postId']}: " + "; ".join(issue["issue"] for issue in blocking))
+            continue
+        approved.append(post)
+    return approved
+
 # Generate all posts
 def generate_all_posts():
     all_posts = {
-        "ADV001": generate_adv001_posts(),
-        "ADV002": generate_adv002_posts(),
-        "ADV003": generate_adv003_posts(),
-        "ADV004": generate_adv004_posts()
+        "ADV001": compliant_posts(generate_adv001_posts()),
+        "ADV002": compliant_posts(generate_adv002_posts()),
+        "ADV003": compliant_posts(generate_adv003_posts()),
+        "ADV004": compliant_posts(generate_adv004_posts())
     }
-    return all_posts
+    return {advisor_id: posts for advisor_id, posts in all_posts.items() if posts}
+
+# Output files are numbered by the post's own ID (ADV001_POST_3 -> ADV001_post_3),
+# so rejecting a draft never renumbers the posts after it
+POST_FILE_PATTERN = re.compile(r"^\w+_post_\d+\.(?:json|txt)$")
+
+def post_number(post):
+    return int(post["postId"].rsplit("_", 1)[1])
 
 # Save posts to JSON and TEXT files
 def save_posts(all_posts):
@@ -1941,6 +1962,7 @@ def save_posts(all_posts):
     }
 
     all_virality_scores = []
+    written = set()
 
     for advisor_id, posts in all_posts.items():
         advisor_summary = {
@@ -1952,9 +1974,9 @@ def save_posts(all_posts):
             "posts": []
         }
 
-        for idx, post in enumerate(posts, 1):
+        for post in posts:
             # Save JSON
-            json_filename = f"{json_dir}/{advisor_id}_post_{idx}.json"
+            json_filename = f"{json_dir}/{advisor_id}_post_{post_number(post)}.json"
             with open(json_filename, 'w', encoding='utf-8') as f:
                 json.dump(post, f, indent=2, ensure_ascii=False)
 
@@ -1962,9 +1984,10 @@ def save_posts(all_posts):
             text_content = f"{post['content']}\n\n"
             text_content += " ".join(post['hashtags'])
 
-            text_filename = f"{text_dir}/{advisor_id}_post_{idx}.txt"
+            text_filename = f"{text_dir}/{advisor_id}_post_{post_number(post)}.txt"
             with open(text_filename, 'w', encoding='utf-8') as f:
                 f.write(text_content)
+            written.update((json_filename, text_filename))
 
             # Track virality
             all_virality_scores.append({
@@ -1986,11 +2009,18 @@ def save_posts(all_posts):
 
         summary_data["advisors"].append(advisor_summary)
 
-    # Calculate virality stats
+    # Posts from an earlier run that were rejected this time must not be distributed
+    for directory in (json_dir, text_dir):
+        for filename in os.listdir(directory):
+            path = f"{directory}/{filename}"
+            if POST_FILE_PATTERN.match(filename) and path not in written:
+                os.remove(path)
+
+    # Calculate virality stats (every draft may have been rejected)
     scores = [s["score"] for s in all_virality_scores]
-    summary_data["viralityStats"]["averageScore"] = round(sum(scores) / len(scores), 2)
+    summary_data["viralityStats"]["averageScore"] = round(sum(scores) / len(scores), 2) if scores else 0
     summary_data["viralityStats"]["allScores"] = sorted(all_virality_scores, key=lambda x: x["score"], reverse=True)
-    summary_data["viralityStats"]["highest"] = summary_data["viralityStats"]["allScores"][0]
+    summary_data["viralityStats"]["highest"] = summary_data["viralityStats"]["allScores"][0] if scores else {}
     summary_data["viralityStats"]["top3"] = summary_data["viralityStats"]["allScores"][:3]
 
     # Save summary
@@ -9,18 +9,618 @@ This script implements:
 - Learning system
 """
 
+import argparse
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+import hashlib
+import importlib.util
 import json
 import os
+import secrets
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+import sqlite3
 import subprocess
+import sys
+import threading
 import time
 
-class FinAdviseOrchestrator:
+import span_trace
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, spans report no RSS
+    resource = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: file locks become no-ops
+    fcntl = None
+
+# Pipeline DAG: each agent starts as soon as all of its dependencies succeed
+PIPELINE_AGENTS = [
+    {
+        "name": "advisor-data-manager",
+        "prompt": "Fetch advisor data from data/advisors.json",
+        "dependencies": [],
+        "inputs": ["data/advisors.json"]
+    },
+    {
+        "name": "market-intelligence",
+        "prompt": "Analyze market data from data/market-intelligence.json",
+        "dependencies": [],
+        "inputs": ["data/market-intelligence.json"]
+    },
+    {
+        "name": "segment-analyzer",
+        "prompt": "Analyze advisor segments based on advisor data",
+        "dependencies": ["advisor-data-manager"]
+    },
+    {
+        "name": "linkedin-post-generator",
+        "prompt": "Generate LinkedIn posts using market data and segments",
+        "dependencies": ["market-intelligence", "segment-analyzer"],
+        "inputs": ["data/advisors.json"]
+    },
+    {
+        "name": "whatsapp-message-creator",
+        "prompt": "Create WhatsApp messages using market insights",
+        "dependencies": ["market-intelligence", "segment-analyzer"],
+        "inputs": ["data/advisors.json"]
+    },
+    {
+        "name": "status-image-designer",
+        "prompt": "Design WhatsApp status images",
+        "dependencies": ["market-intelligence"]
+    },
+    {
+        "name": "gemini-image-generator",
+        "prompt": "Generate images based on designs",
+        "dependencies": ["status-image-designer"]
+    },
+    {
+        "name": "brand-customizer",
+        "prompt": "Apply advisor branding to all content",
+        "dependencies": ["linkedin-post-generator", "whatsapp-message-creator", "gemini-image-generator"],
+        "inputs": ["data/advisors.json"],
+        "per_advisor": True
+    },
+    {
+        "name": "compliance-validator",
+        "prompt": "Validate all content for SEBI compliance",
+        "dependencies": ["linkedin-post-generator", "whatsapp-message-creator"],
+        "inputs": ["data/advisors.json"],
+        "per_advisor": True
+    },
+    {
+        "name": "quality-scorer",
+        "prompt": "Score content quality",
+        "dependencies": ["compliance-validator"],
+        "inputs": ["data/advisors.json"]
+    },
+    {
+        "name": "fatigue-checker",
+        "prompt": "Check content freshness against 30-day history",
+        "dependencies": ["linkedin-post-generator", "whatsapp-message-creator"],
+        "inputs": ["data/advisors.json"],
+        "per_advisor": True
+    },
+    {
+        "name": "distribution-controller",
+        "prompt": "Manage content distribution",
+        "dependencies": ["compliance-validator", "quality-scorer"]
+    },
+    {
+        "name": "analytics-tracker",
+        "prompt": "Track and analyze metrics",
+        "dependencies": ["distribution-controller"]
+    },
+    {
+        "name": "feedback-processor",
+        "prompt": "Process feedback for improvements",
+        "dependencies": ["analytics-tracker"],
+        "context_keys": ["analytics-tracker", "quality-scorer", "fatigue-checker"]
+    }
+]
+
+DEFAULT_MAX_WORKERS = 4
+
+# Per-session quota on concurrent Gemini calls
+DEFAULT_GEMINI_CONCURRENCY = 2
+
+# Per-advisor stages are split into shards of this many advisors and run
+# on a process pool
+ADVISORS_FILE = Path("data/advisors.json")
+DEFAULT_SHARD_SIZE = 25
+
+# Agent outputs keyed by input fingerprint, reused across sessions. An
+# output's "artifacts" (paths relative to the session dir) are copied from
+# the producing session when it is reused by another one
+AGENT_CACHE_DIR = Path("data/agent-cache")
+
+# Output fields that change on every run and must not affect fingerprints
+VOLATILE_OUTPUT_KEYS = ("timestamp", "cached", "cached_from")
+
+def new_session_id():
+    """Session ID unique across concurrent starts: millisecond timestamp plus random suffix"""
+    now = datetime.now()
+    return f"session_{now.strftime('%Y-%m-%dT%H-%M-%S')}-{now.microsecond // 1000:03d}Z-{secrets.token_hex(3)}"
+
+@contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock on a sidecar <path>.lock file"""
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'w') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def hash_file(path):
+    """SHA-256 of a file's content, or a marker if it does not exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return "missing"
+
+# Prompt context budget: shared memory is sent compactly and capped
+MAX_CONTEXT_CHARS = 2000
+
+def build_prompt_context(shared_memory, context_keys, max_chars=MAX_CONTEXT_CHARS):
+    """Compact JSON of only the shared-memory keys an agent needs.
+
+    A key is selected when it equals a declared key or starts with
+    "<declared>_" (e.g. "market-intelligence" selects
+    "market-intelligence_completed"). Keys beyond the size cap are dropped
+    and counted in "_truncated".
+    """
+    # Room for the braces and the "_truncated" marker
+    budget = max_chars - len('{"_truncated":0000000}')
+    parts = []
+    size = 0
+    dropped = 0
+    for key in sorted(shared_memory):
+        if not any(key == wanted or key.startswith(f"{wanted}_") for wanted in context_keys):
+            continue
+        part = f"{json.dumps(key)}:{json.dumps(shared_memory[key], separators=(',', ':'), sort_keys=True)}"
+        if size + len(part) + 1 > budget:
+            dropped += 1
+            continue
+        parts.append(part)
+        size += len(part) + 1
+
+    if dropped:
+        parts.insert(0, f'"_truncated":{dropped}')
+    return "{" + ",".join(parts) + "}"
+
+# Communication bus: recent messages kept in memory for prompts, the full
+# log is appended to disk in batches and at every agent checkpoint
+MESSAGE_BUS_WINDOW = 5
+MESSAGE_FLUSH_BATCH = 20
+
+def load_advisors(advisors_file=ADVISORS_FILE):
+    """Advisor records from data/advisors.json, in file order"""
+    with open(advisors_file, 'r') as f:
+        data = json.load(f)
+    return data.get('advisors', []) if isinstance(data, dict) else data
+
+def load_advisor_ids(advisors_file=ADVISORS_FILE):
+    """Advisor IDs from data/advisors.json, in file order"""
+    return [advisor['id'] for advisor in load_advisors(advisors_file)]
+
+def shard_advisors(advisor_ids, shard_size):
+    """Split advisor IDs into consecutive shards of at most shard_size"""
+    return [advisor_ids[i:i + shard_size] for i in range(0, len(advisor_ids), shard_size)]
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KB on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+class SpanTracer:
+    """Collects timing spans and exports them as a Chrome trace.
+
+    Each span records its wall time. Agent spans overlap on one event loop,
+    so their CPU time and peak RSS are process-wide (process_cpu_ms,
+    process_peak_rss_kb) and include concurrent agents; shard spans run
+    alone in a pool worker and carry their own cpu_ms. The export loads in
+    chrome://tracing or Perfetto.
+    """
+
     def __init__(self):
-        self.session_id = f"session_{datetime.now().strftime('%Y-%m-%dT%H-%M-%S-000Z')}"
-        self.output_dir = Path(f"output/{self.session_id}")
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.events = []
+        self.pid = os.getpid()
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def lane(self, name):
+        """Stable trace row (tid) per agent so concurrent agents do not overlap"""
+        with self._lock:
+            if name not in self._lanes:
+                self._lanes[name] = len(self._lanes) + 1
+            return self._lanes[name]
+
+    @contextmanager
+    def span(self, name, cat="agent", lane=None, **args):
+        """Time the enclosed block; usable across awaits inside a coroutine"""
+        start_ts = time.time()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield args
+        finally:
+            self.add_span({
+                "name": name,
+                "cat": cat,
+                "start": start_ts,
+                "wall_ms": (time.perf_counter() - start_wall) * 1000,
+                "metrics": {
+                    "process_cpu_ms": (time.process_time() - start_cpu) * 1000,
+                    "process_peak_rss_kb": peak_rss_kb()
+                },
+                "pid": self.pid,
+                "tid": self.lane(lane or name),
+                "args": args
+            })
+
+    def add_span(self, span):
+        """Record a finished span, also used for spans measured in pool workers"""
+        event = {
+            "name": span["name"],
+            "cat": span["cat"],
+            "ph": "X",
+            "ts": round(span["start"] * 1_000_000),
+            "dur": round(span["wall_ms"] * 1000),
+            "pid": span["pid"],
+            "tid": span["tid"],
+            "args": dict(span.get("args", {}),
+                         wall_ms=round(span["wall_ms"], 3),
+                         **{key: round(value, 3) if isinstance(value, float) else value
+                            for key, value in span.get("metrics", {}).items()})
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def restore(self, trace, exclude=()):
+        """Reload a previous export: its lanes, so tids stay stable, and its spans"""
+        exclude = {json.dumps(event, sort_keys=True) for event in exclude}
+        with self._lock:
+            for event in trace.get("traceEvents", []):
+                if event.get("ph") == "M" and event.get("name") == "thread_name":
+                    self.pid = event["pid"]
+                    self._lanes[event["args"]["name"]] = event["tid"]
+                elif event.get("ph") == "X" and json.dumps(event, sort_keys=True) not in exclude:
+                    self.events.append(event)
+
+    def export(self, path, extra_events=()):
+        """Write all spans, plus extra_events, to a Chrome-trace-compatible JSON file"""
+        with self._lock:
+            lane_names = [
+                {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                for name, tid in self._lanes.items()
+            ]
+            events = lane_names + sorted([*self.events, *extra_events], key=lambda e: e["ts"])
+        atomic_write_json(path, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+def shard_report_path(agent_name):
+    """Per-advisor stage report, relative to the session dir"""
+    return f"reports/{agent_name}-shards.json"
+
+def simulate_advisor_shard(agent_name, agent_prompt, advisor_ids, session_id, output_dir):
+    """Default shard runner until the stage is wired to the Task tool / MCP"""
+    return {
+        advisor_id: {
+            "status": "completed",
+            "timestamp": datetime.now().isoformat(),
+            "pid": os.getpid()
+        }
+        for advisor_id in advisor_ids
+    }
+
+# Shard contract: def runner(agent_name, agent_prompt, advisor_ids, session_id, output_dir)
+# -> {advisor_id: {"status": "completed" | "failed", ...}}. Runners execute in pool
+# workers, so they must be module-level functions registered at import time;
+# per-advisor stages without one fall back to simulate_advisor_shard.
+SHARD_RUNNERS = {}
+
+def register_shard_runner(agent_name):
+    """Decorator registering the function that runs a per-advisor stage for one shard"""
+    def decorator(runner):
+        SHARD_RUNNERS[agent_name] = runner
+        return runner
+    return decorator
+
+ROOT_DIR = Path(__file__).resolve().parent
+
+@lru_cache(maxsize=None)
+def load_script(relative_path):
+    """Import a (hyphenated) repo script once per process, pool workers included"""
+    path = ROOT_DIR / relative_path
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def load_branded_items(output_dir, advisor_ids):
+    """Branded LinkedIn / WhatsApp items of the given advisors: {advisor_id: [(channel, item)]}"""
+    items = {advisor_id: [] for advisor_id in advisor_ids}
+    for channel in ("linkedin", "whatsapp"):
+        for path in sorted(Path(output_dir, channel, "branded").glob("*.json")):
+            with open(path, 'r', encoding='utf-8') as f:
+                item = json.load(f)
+            if isinstance(item, dict) and item.get("advisorId") in items:
+                items[item["advisorId"]].append((channel, item))
+    return items
+
+@register_shard_runner("brand-customizer")
+def brand_customizer_shard(agent_name, agent_prompt, advisor_ids, session_id, output_dir):
+    """Brand each advisor's validated status images"""
+    processor = load_script("agents/brand-customizer-processor.py")
+    input_dir = f"{output_dir}/images/status/validated"
+    final_dir = f"{output_dir}/images/status/final"
+    # Prefixes are resolved over every advisor, since first names collide across shards
+    advisors = load_advisors()
+    prefixes = dict(zip((advisor['id'] for advisor in advisors), processor.image_prefixes(advisors, input_dir)))
+    advisors = {advisor['id']: advisor for advisor in advisors}
+
+    results = {}
+    for advisor_id in advisor_ids:
+        images, log = processor.brand_advisor_images(prefixes[advisor_id], advisors[advisor_id],
+                                                     input_dir, final_dir)
+        errors = [image['error'] for image in images if image.get('error')]
+        results[advisor_id] = {
+            "status": "failed" if errors else "completed",
+            "images_branded": len(images) - len(errors),
+            "errors": errors,
+            "log": log
+        }
+    return results
+
+@register_shard_runner("compliance-validator")
+def compliance_shard(agent_name, agent_prompt, advisor_ids, session_id, output_dir):
+    """SEBI-check each advisor's branded posts and messages"""
+    validator = load_script("validate-sebi-compliance.py")
+    results = {}
+    for advisor_id, items in load_branded_items(output_dir, advisor_ids).items():
+        issues = []
+        for channel, item in items:
+            identifier = item.get("postId") or f"{advisor_id}_{item.get('messageId', channel)}"
+            issues += validator.check(item.get("content") or item.get("text", ""), channel, identifier)
+        blocking = validator.blocking_issues(issues)
+        results[advisor_id] = {
+            "status": "completed",
+            "items": len(items),
+            "issues": len(issues),
+            "blocking": [f"{issue['content_id']}: {issue['issue']}" for issue in blocking],
+            "compliant": not blocking
+        }
+    return results
+
+@register_shard_runner("fatigue-checker")
+def fatigue_shard(agent_name, agent_prompt, advisor_ids, session_id, output_dir):
+    """Freshness of each advisor's branded content against the history window"""
+    fatigue = load_script("agents/fatigue-checker.py")
+    checker = fatigue.FatigueChecker(session_id, output_root=str(Path(output_dir).parent))
+    analyses = checker.analyze_advisors(advisor_ids, checker.load_current_content())
+    return {
+        advisor_id: {"status": "completed", **analysis}
+        for advisor_id, analysis in analyses.items()
+    }
+
+def run_advisor_shard(agent_name, agent_prompt, advisor_ids, session_id, output_dir):
+    """Run one per-advisor stage for a shard of advisors (process pool worker)"""
+    start_ts = time.time()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+
+    # Spans the runner records land in the session's script span file
+    span_trace.configure(Path(output_dir) / "session-config.json")
+
+    # Scoped to the shard; a runner error fails only this shard's advisors
+    runner = SHARD_RUNNERS.get(agent_name, simulate_advisor_shard)
+    try:
+        advisors = dict(runner(agent_name, agent_prompt, advisor_ids, session_id, output_dir))
+    except Exception as e:
+        advisors = {advisor_id: {"status": "failed", "error": str(e)} for advisor_id in advisor_ids}
+    for advisor_id in advisor_ids:
+        advisors.setdefault(advisor_id, {"status": "failed", "error": "No result from shard runner"})
+
+    # Timed here, since the worker's CPU and RSS are invisible to the parent.
+    # A worker runs one shard at a time, so cpu_ms is this shard's own; RSS is
+    # the worker's high-water mark across every shard it has run
+    span = {
+        "name": f"{agent_name} [{advisor_ids[0]}..{advisor_ids[-1]}]",
+        "cat": "shard",
+        "start": start_ts,
+        "wall_ms": (time.perf_counter() - start_wall) * 1000,
+        "metrics": {
+            "cpu_ms": (time.process_time() - start_cpu) * 1000,
+            "worker_peak_rss_kb": peak_rss_kb()
+        },
+        "pid": os.getpid(),
+        "tid": 0,
+        "args": {"agent": agent_name, "advisors": len(advisor_ids)}
+    }
+    return {"advisors": advisors, "span": span}
+
+async def simulate_agent(orchestrator, agent_name, prompt, context):
+    """Default agent coroutine until the agent is wired to the Task tool / MCP"""
+    return {"status": "completed", "timestamp": datetime.now().isoformat()}
+
+# Agent contract: async def runner(orchestrator, agent_name, prompt, context) -> dict.
+# A runner may await many concurrent calls (Gemini, vision checks, file writes);
+# each Gemini call goes inside `async with orchestrator.gemini_slot()` and
+# orchestrator.tracer.span(..., cat="gemini", lane=agent_name);
+# agents without a registered runner fall back to simulate_agent.
+AGENT_RUNNERS = {}
+
+def register_agent(agent_name):
+    """Decorator registering the coroutine that executes an agent"""
+    def decorator(runner):
+        AGENT_RUNNERS[agent_name] = runner
+        return runner
+    return decorator
+
+def read_communication_log(output_dir):
+    """Rebuild the full message log of a session from its JSONL stream"""
+    output_dir = Path(output_dir)
+    log_file = output_dir / "communication_log.jsonl"
+    legacy_file = output_dir / "communication_log.json"
+
+    if log_file.exists():
+        messages = []
+        with open(log_file, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    messages.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-append
+                    break
+        return messages
+
+    if legacy_file.exists():
+        with open(legacy_file, 'r') as f:
+            return json.load(f)
+
+    return []
+
+def atomic_write_json(path, data):
+    """Write JSON via a temp file and rename, so a crash never leaves a torn file"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Shared memory: one SQLite store, namespaced per session
+SHARED_MEMORY_DB = Path("data/shared-memory.db")
+
+class SharedMemoryStore:
+    """Transactional key-value store behind the shared-memory JSON files.
+
+    Values live in SQLite (WAL mode) keyed by (session_id, document, key),
+    so agents update single keys instead of rewriting whole documents and
+    concurrent sessions never overwrite each other. export_document()
+    writes the legacy JSON files for agents that still read them.
+    """
+
+    def __init__(self, db_path=SHARED_MEMORY_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        with self.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shared_memory (
+                    session_id TEXT NOT NULL,
+                    document TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (session_id, document, key)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_shared_memory_lookup
+                ON shared_memory (document, key, updated_at)
+            """)
+
+    def connection(self):
+        """One connection per thread, opened lazily in WAL mode"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, session_id, document, key, value):
+        """Set a single key"""
+        self.update(session_id, document, {key: value})
+
+    def update(self, session_id, document, values):
+        """Set several keys of a document in one transaction"""
+        now = datetime.now().isoformat()
+        rows = [(session_id, document, key, json.dumps(value), now) for key, value in values.items()]
+        with self.connection() as conn:
+            conn.executemany("""
+                INSERT INTO shared_memory (session_id, document, key, value, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (session_id, document, key)
+                DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """, rows)
+
+    def get(self, session_id, document, key, default=None):
+        """Read a single key"""
+        row = self.connection().execute(
+            "SELECT value FROM shared_memory WHERE session_id = ? AND document = ? AND key = ?",
+            (session_id, document, key)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_document(self, session_id, document):
+        """Read every key of a document as a dict"""
+        rows = self.connection().execute(
+            "SELECT key, value FROM shared_memory WHERE session_id = ? AND document = ? ORDER BY key",
+            (session_id, document)
+        ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def find(self, document, key, limit=10):
+        """Most recent values of a key across all sessions, newest first"""
+        rows = self.connection().execute("""
+            SELECT session_id, value FROM shared_memory
+            WHERE document = ? AND key = ?
+            ORDER BY updated_at DESC LIMIT ?
+        """, (document, key, limit)).fetchall()
+        return [(session_id, json.loads(value)) for session_id, value in rows]
+
+    def export_document(self, session_id, document, path, wrap=None):
+        """Write a document to its legacy JSON file for compatibility"""
+        data = self.get_document(session_id, document)
+        if wrap:
+            data = wrap(data)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(path):
+            atomic_write_json(path, data)
+
+class FinAdviseOrchestrator:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, use_cache=True, resume_session_id=None,
+                 shard_size=DEFAULT_SHARD_SIZE, processes=None,
+                 gemini_concurrency=DEFAULT_GEMINI_CONCURRENCY):
+        if resume_session_id:
+            self.session_id = resume_session_id
+            self.output_dir = Path(f"output/{self.session_id}")
+            if not (self.output_dir / "session_state.json").exists():
+                raise FileNotFoundError(f"No checkpoint to resume for {resume_session_id} in {self.output_dir}")
+        else:
+            # Claim a fresh directory; mkdir fails if another session took the ID
+            while True:
+                self.session_id = new_session_id()
+                self.output_dir = Path(f"output/{self.session_id}")
+                try:
+                    self.output_dir.mkdir(parents=True)
+                    break
+                except FileExistsError:
+                    continue
 
         # Session Management
         self.session_state = {
@@ -28,9 +628,49 @@ class FinAdviseOrchestrator:
             "started_at": datetime.now().isoformat(),
             "agents_executed": [],
             "current_agent": None,
+            "running_agents": [],
+            "max_workers": max_workers,
             "status": "INITIALIZING"
         }
 
+        # Scheduler: worker pool size and a lock guarding shared state,
+        # since independent agents run concurrently
+        self.max_workers = max_workers
+        self._lock = threading.RLock()
+
+        # Incremental re-execution: skip agents whose inputs are unchanged
+        self.use_cache = use_cache
+
+        # Shared memory store, namespaced by session
+        self.shared_store = SharedMemoryStore()
+
+        # Advisor sharding: per-advisor stages fan out over a process pool.
+        # processes is this session's CPU worker quota
+        self.shard_size = shard_size
+        self.processes = processes or os.cpu_count()
+        self._process_pool = None
+
+        # Gemini quota: at most gemini_concurrency calls in flight for this session.
+        # An asyncio.Semaphore, created in the running loop on first use
+        self.gemini_concurrency = gemini_concurrency
+        self._gemini_slots = None
+        self._gemini_loop = None
+
+        # Spans appended by scripts and shard runners via span_trace,
+        # merged into trace.json on export
+        self.script_spans_file = self.output_dir / "script-spans.jsonl"
+
+        # Per-session config handed to agents and scripts instead of globals
+        self.session_config_file = self.output_dir / "session-config.json"
+        atomic_write_json(self.session_config_file, {
+            "sessionId": self.session_id,
+            "sessionDir": str(self.output_dir.resolve()),
+            "maxWorkers": self.max_workers,
+            "cpuWorkers": self.processes,
+            "geminiConcurrency": self.gemini_concurrency,
+            "traceFile": str(self.script_spans_file.resolve())
+        })
+
         # Agent Memory Management
         self.agent_memory = {
             "shared_context": {},
@@ -38,30 +678,100 @@ class FinAdviseOrchestrator:
             "cross_references": []
         }
 
-        # Communication Bus
-        self.message_bus = []
+        # Communication Bus: ring buffer of recent messages plus pending appends
+        self.message_bus = deque(maxlen=MESSAGE_BUS_WINDOW)
+        self.message_count = 0
+        self._pending_messages = []
 
         # Learning System
         self.session_learnings = []
 
+        # Tracing: per-agent and per-shard spans, exported as trace.json
+        self.tracer = SpanTracer()
+
+        if resume_session_id:
+            self.load_checkpoint()
+
     def save_session_state(self):
         """Persist session state for recovery"""
         state_file = self.output_dir / "session_state.json"
-        with open(state_file, 'w') as f:
-            json.dump(self.session_state, f, indent=2)
+        with self._lock:
+            atomic_write_json(state_file, self.session_state)
+
+    def save_agent_memory(self):
+        """Checkpoint agent memory so a resumed session sees completed outputs"""
+        memory_file = self.output_dir / "agent_memory.json"
+        with self._lock:
+            atomic_write_json(memory_file, self.agent_memory)
+
+    def load_checkpoint(self):
+        """Reload session state, agent memory and message bus from disk"""
+        with open(self.output_dir / "session_state.json", 'r') as f:
+            self.session_state = json.load(f)
+
+        memory_file = self.output_dir / "agent_memory.json"
+        if memory_file.exists():
+            with open(memory_file, 'r') as f:
+                self.agent_memory = json.load(f)
+
+        messages = read_communication_log(self.output_dir)
+        self.message_bus.extend(messages)
+        self.message_count = len(messages)
+
+        # Keep the spans and lanes of the interrupted run in the exported trace;
+        # script spans are merged again from their own file on export
+        trace_file = self.output_dir / "trace.json"
+        if trace_file.exists():
+            with open(trace_file, 'r') as f:
+                self.tracer.restore(json.load(f), exclude=span_trace.read_spans(self.script_spans_file))
+
+        # Only agents whose output survived the crash count as completed
+        outputs = self.agent_memory["agent_outputs"]
+        self.session_state["agents_executed"] = [
+            entry for entry in self.session_state["agents_executed"]
+            if entry.get("status") != "SUCCESS" or entry["name"] in outputs
+        ]
+        self.session_state["running_agents"] = []
+        self.session_state["max_workers"] = self.max_workers
+        self.session_state["status"] = "RESUMING"
+        self.session_state.setdefault("resumed_at", []).append(datetime.now().isoformat())
+
+    def completed_agents(self):
+        """Names of agents already marked SUCCESS in this session"""
+        return {
+            entry["name"] for entry in self.session_state["agents_executed"]
+            if entry.get("status") == "SUCCESS"
+        }
 
     def update_shared_memory(self, agent_name, data):
         """Update shared memory accessible to all agents"""
-        self.agent_memory["agent_outputs"][agent_name] = data
-        self.agent_memory["shared_context"].update({
+        context_update = {
             f"{agent_name}_completed": True,
             f"{agent_name}_timestamp": datetime.now().isoformat()
-        })
+        }
 
-        # Save to shared context file
-        shared_file = Path("data/shared-context.json")
-        with open(shared_file, 'w') as f:
-            json.dump(self.agent_memory["shared_context"], f, indent=2)
+        # Only this agent's keys are written, not the whole document
+        self.shared_store.update(self.session_id, "shared-context", context_update)
+        self.shared_store.put(self.session_id, "agent-memory", agent_name, data)
+
+        with self._lock:
+            self.agent_memory["agent_outputs"][agent_name] = data
+            self.agent_memory["shared_context"].update(context_update)
+            self.save_agent_memory()
+
+    def export_shared_memory(self):
+        """Export this session's shared memory to the legacy JSON files"""
+        self.shared_store.export_document(
+            self.session_id, "shared-context", Path("data/shared-context.json")
+        )
+        self.shared_store.export_document(
+            self.session_id, "agent-memory", Path("data/shared-memory/agent-memory.json"),
+            wrap=lambda outputs: {
+                "sessionId": self.session_id,
+                "timestamp": datetime.now().isoformat(),
+                "agentMemory": outputs
+            }
+        )
 
     def broadcast_message(self, sender, message, data=None):
         """Broadcast message to all agents via communication bus"""
@@ -71,175 +781,418 @@ class FinAdviseOrchestrator:
             "message": message,
             "data": data
         }
-        self.message_bus.append(msg)
+        with self._lock:
+            self.message_bus.append(msg)
+            self.message_count += 1
+            self._pending_messages.append(msg)
 
-        # Save to communication log
-        comm_log = self.output_dir / "communication_log.json"
-        with open(comm_log, 'w') as f:
-            json.dump(self.message_bus, f, indent=2)
+            # Append to communication log in batches
+            if len(self._pending_messages) >= MESSAGE_FLUSH_BATCH:
+                self.flush_message_bus()
 
-    def execute_agent(self, agent_name, agent_prompt, dependencies=None):
-        """Execute an agent with full context and memory"""
-        print(f"\n🤖 Executing: {agent_name}")
+    def flush_message_bus(self):
+        """Append buffered messages to the session's JSONL communication log"""
+        with self._lock:
+            if not self._pending_messages:
+                return
+            comm_log = self.output_dir / "communication_log.jsonl"
+            with open(comm_log, 'a') as f:
+                f.write("".join(json.dumps(msg) + "\n" for msg in self._pending_messages))
+            self._pending_messages = []
 
-        # Check dependencies
-        if dependencies:
-            for dep in dependencies:
-                if dep not in self.agent_memory["agent_outputs"]:
-                    print(f"⚠️ Waiting for dependency: {dep}")
-                    return None
+    def compute_fingerprint(self, agent_prompt, previous_outputs, inputs):
+        """Fingerprint everything an agent reads: prompt, dependency outputs, input files"""
+        stable_outputs = {
+            name: {k: v for k, v in output.items() if k not in VOLATILE_OUTPUT_KEYS}
+            for name, output in previous_outputs.items()
+        }
+        payload = {
+            "prompt": agent_prompt,
+            "dependencies": stable_outputs,
+            "inputs": {path: hash_file(path) for path in sorted(inputs or [])}
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
 
-        # Update session state
-        self.session_state["current_agent"] = agent_name
-        self.session_state["status"] = f"EXECUTING_{agent_name.upper()}"
-        self.save_session_state()
+    def load_cached_output(self, agent_name, fingerprint):
+        """Return the cache entry (output and producing session_id) if its fingerprint matches"""
+        cache_file = AGENT_CACHE_DIR / f"{agent_name}.json"
+        try:
+            with open(cache_file, 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if entry.get("fingerprint") != fingerprint or "output" not in entry:
+            return None
+        return entry
+
+    def materialize_artifacts(self, source_session_id, artifacts):
+        """Copy a cached agent's files from the session that produced them.
+
+        Returns False, copying nothing, if that session or any file is gone.
+        """
+        if not source_session_id:
+            return False
+        source_dir = Path(f"output/{source_session_id}")
+        if not all((source_dir / artifact).is_file() for artifact in artifacts):
+            return False
+        for artifact in artifacts:
+            target = self.output_dir / artifact
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source_dir / artifact, target)
+        return True
 
-        # Prepare context for agent
-        context = {
+    def save_cached_output(self, agent_name, fingerprint, output_data):
+        """Store an agent output under its input fingerprint"""
+        AGENT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file = AGENT_CACHE_DIR / f"{agent_name}.json"
+        # Shared by all sessions: locked, and atomic so readers never see a torn file
+        with file_lock(cache_file):
+            atomic_write_json(cache_file, {
+                "fingerprint": fingerprint,
+                "session_id": self.session_id,
+                "output": output_data
+            })
+
+    def reuse_cached_output(self, agent_name, fingerprint, per_advisor):
+        """Cached output to reuse for this run, with its artifacts in place, or None.
+
+        Within the same session (a resume) the artifacts are already on disk;
+        from another session they are copied over, and the entry is treated
+        as a miss if they cannot be.
+        """
+        if not self.use_cache:
+            return None
+        entry = self.load_cached_output(agent_name, fingerprint)
+        if entry is None:
+            return None
+        output = dict(entry["output"], cached=True)
+        artifacts = output.get("artifacts", [])
+        # Entries written before artifacts were recorded lack the shard report
+        if per_advisor and shard_report_path(agent_name) not in artifacts:
+            return None
+        source_session_id = entry.get("session_id")
+        if source_session_id != self.session_id:
+            if not self.materialize_artifacts(source_session_id, artifacts):
+                return None
+            output["cached_from"] = source_session_id
+        return output
+
+    @asynccontextmanager
+    async def gemini_slot(self):
+        """Hold one of this session's Gemini slots for the duration of a call.
+
+        Waiters are suspended on the event loop, not parked in executor
+        threads, so slot holders can still use asyncio.to_thread for their
+        calls, and a waiter cancelled mid-acquire gives up nothing.
+        """
+        loop = asyncio.get_running_loop()
+        # execute_agent starts a new loop per call; a semaphore binds to one loop
+        if self._gemini_loop is not loop:
+            self._gemini_loop = loop
+            self._gemini_slots = asyncio.Semaphore(self.gemini_concurrency)
+        async with self._gemini_slots:
+            yield
+
+    def get_process_pool(self):
+        """Process pool shared by all per-advisor stages, created on first use"""
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+            return self._process_pool
+
+    async def run_sharded(self, agent_name, agent_prompt):
+        """Run a per-advisor stage over advisor shards and merge the results"""
+        shards = shard_advisors(await asyncio.to_thread(load_advisor_ids), self.shard_size)
+        pool = self.get_process_pool()
+        loop = asyncio.get_running_loop()
+
+        # Merge in shard order so the report is deterministic
+        shard_results = await asyncio.gather(*[
+            loop.run_in_executor(pool, run_advisor_shard, agent_name, agent_prompt, shard,
+                                 self.session_id, str(self.output_dir))
+            for shard in shards
+        ])
+        advisors = {}
+        for result in shard_results:
+            advisors.update(result["advisors"])
+            self.tracer.add_span(result["span"])
+
+        failed = sorted(a for a, result in advisors.items() if result.get("status") != "completed")
+        report = {
+            "agent": agent_name,
             "session_id": self.session_id,
-            "shared_memory": self.agent_memory["shared_context"],
-            "previous_outputs": {k: v for k, v in self.agent_memory["agent_outputs"].items() if k in (dependencies or [])},
-            "message_bus": self.message_bus[-5:] if self.message_bus else []  # Last 5 messages
+            "shard_size": self.shard_size,
+            "shard_count": len(shards),
+            "advisor_count": len(advisors),
+            "failed_advisors": failed,
+            "advisors": advisors
         }
+        reports_dir = self.output_dir / "reports"
+        reports_dir.mkdir(exist_ok=True)
+        await asyncio.to_thread(atomic_write_json, self.output_dir / shard_report_path(agent_name), report)
+
+        print(f"🧩 {agent_name}: {len(advisors)} advisors in {len(shards)} shards")
+        return report
 
-        # Enhanced prompt with context
+    async def run_agent(self, agent_name, agent_prompt, dependencies=None, inputs=None, per_advisor=False,
+                        context_keys=None):
+        """Execute an agent with full context and memory.
+
+        Blocking work (checkpoints, cache, shared memory) is pushed to
+        threads so many I/O-bound agents can interleave on one event loop.
+        """
+        with self.tracer.span(agent_name, cat="agent", per_advisor=per_advisor) as span_args:
+            try:
+                output_data = await self._run_agent(agent_name, agent_prompt, dependencies, inputs, per_advisor,
+                                                    context_keys)
+            finally:
+                self.release_agent(agent_name)
+            span_args["cached"] = bool(output_data and output_data.get("cached"))
+            span_args["prompt_chars"] = self.session_state.get("prompt_sizes", {}).get(agent_name, {}).get("chars")
+            return output_data
+
+    async def _run_agent(self, agent_name, agent_prompt, dependencies, inputs, per_advisor, context_keys):
+        print(f"\n🤖 Executing: {agent_name}")
+
+        with self._lock:
+            # Check dependencies
+            if dependencies:
+                for dep in dependencies:
+                    if dep not in self.agent_memory["agent_outputs"]:
+                        print(f"⚠️ Waiting for dependency: {dep}")
+                        return None
+
+            # Update session state
+            self.session_state["current_agent"] = agent_name
+            self.session_state["running_agents"].append(agent_name)
+            self.session_state["status"] = f"EXECUTING_{agent_name.upper()}"
+
+            # Prepare context for agent (snapshot, other agents may be writing)
+            context = {
+                "session_id": self.session_id,
+                "session_config": str(self.session_config_file),
+                "shared_memory": dict(self.agent_memory["shared_context"]),
+                "previous_outputs": {k: v for k, v in self.agent_memory["agent_outputs"].items() if k in (dependencies or [])},
+                "message_bus": list(self.message_bus)  # Last MESSAGE_BUS_WINDOW messages
+            }
+        await asyncio.to_thread(self.save_session_state)
+
+        # Reuse the previous output when nothing the agent reads has changed
+        fingerprint = await asyncio.to_thread(
+            self.compute_fingerprint, agent_prompt, context["previous_outputs"], inputs
+        )
+        cached_output = await asyncio.to_thread(self.reuse_cached_output, agent_name, fingerprint, per_advisor)
+        if cached_output is not None:
+            print(f"♻️  Reusing cached output: {agent_name}")
+            return await asyncio.to_thread(self.complete_agent, agent_name, cached_output)
+
+        # Enhanced prompt with context: only the keys this agent declares
+        # (its dependencies by default), compact and size-capped
+        shared_memory = build_prompt_context(
+            context["shared_memory"],
+            context_keys if context_keys is not None else (dependencies or [])
+        )
         enhanced_prompt = f"""
 {agent_prompt}
 
 CONTEXT:
 Session: {self.session_id}
-Shared Memory: {json.dumps(context['shared_memory'], indent=2)}
+Shared Memory: {shared_memory}
 Dependencies Available: {list(context['previous_outputs'].keys())}
 
 Use this context to coordinate with other agents.
 Save outputs to: {self.output_dir}
 """
 
-        # Execute via Task tool (would be MCP in production)
-        # For now, simulate with subprocess or Task tool call
+        # Track prompt cost per agent (~4 characters per token)
+        with self._lock:
+            self.session_state.setdefault("prompt_sizes", {})[agent_name] = {
+                "chars": len(enhanced_prompt),
+                "context_chars": len(shared_memory),
+                "approx_tokens": len(enhanced_prompt) // 4
+            }
 
-        # Record execution
-        self.session_state["agents_executed"].append({
-            "name": agent_name,
-            "timestamp": datetime.now().isoformat(),
-            "status": "SUCCESS"
-        })
+        # Execute via the agent's registered coroutine (Task tool / MCP in production);
+        # per-advisor stages then fan out over SHARD_RUNNERS
+        runner = AGENT_RUNNERS.get(agent_name, simulate_agent)
+        output_data = await runner(self, agent_name, enhanced_prompt, context)
+        output_data["fingerprint"] = fingerprint
+
+        if per_advisor:
+            report = await self.run_sharded(agent_name, agent_prompt)
+            if report["failed_advisors"]:
+                raise RuntimeError(f"{len(report['failed_advisors'])} advisors failed in {agent_name}")
+            output_data["advisor_count"] = report["advisor_count"]
+            output_data["shard_count"] = report["shard_count"]
+            output_data["artifacts"] = sorted(set(output_data.get("artifacts", [])) | {shard_report_path(agent_name)})
+
+        if self.use_cache:
+            await asyncio.to_thread(self.save_cached_output, agent_name, fingerprint, output_data)
 
-        # Broadcast completion
+        return await asyncio.to_thread(self.complete_agent, agent_name, output_data)
+
+    def execute_agent(self, agent_name, agent_prompt, dependencies=None, inputs=None, per_advisor=False,
+                      context_keys=None):
+        """Synchronous shim around run_agent for existing scripts"""
+        return asyncio.run(self.run_agent(agent_name, agent_prompt, dependencies, inputs, per_advisor,
+                                          context_keys))
+
+    def complete_agent(self, agent_name, output_data):
+        """Record a successful agent run, broadcast it and publish its output"""
+        # Broadcast completion, and persist the log so this checkpoint covers
+        # every message that led to it
         self.broadcast_message(agent_name, f"{agent_name} completed successfully")
+        self.flush_message_bus()
 
-        # Update memory
-        output_data = {"status": "completed", "timestamp": datetime.now().isoformat()}
+        # Update memory (checkpointed before SUCCESS, so a crash in between re-runs the agent)
         self.update_shared_memory(agent_name, output_data)
 
+        # Record execution
+        with self._lock:
+            self.session_state["agents_executed"].append({
+                "name": agent_name,
+                "timestamp": datetime.now().isoformat(),
+                "status": "SUCCESS",
+                "cached": bool(output_data.get("cached"))
+            })
+            self.session_state["running_agents"].remove(agent_name)
+            self.save_session_state()
+
         return output_data
 
+    def release_agent(self, agent_name):
+        """Drop an agent from running_agents if a failure left it there"""
+        with self._lock:
+            if agent_name in self.session_state["running_agents"]:
+                self.session_state["running_agents"].remove(agent_name)
+                self.save_session_state()
+
+    def record_failure(self, agent_name, issue):
+        """Record a failed or skipped agent as a session learning"""
+        with self._lock:
+            self.session_learnings.append({
+                "agent": agent_name,
+                "issue": issue,
+                "timestamp": datetime.now().isoformat()
+            })
+
+    async def schedule_agents_async(self, agents):
+        """Run agents as a DAG on the event loop.
+
+        Every agent is started as soon as all of its dependencies have
+        succeeded, with at most max_workers agents in flight. Agents whose
+        dependencies failed are skipped instead of being run.
+        """
+        known = {agent["name"] for agent in agents}
+        for agent in agents:
+            missing = [dep for dep in agent["dependencies"] if dep not in known]
+            if missing:
+                raise ValueError(f"{agent['name']} depends on unknown agents: {missing}")
+
+        # Agents completed before a crash are not run again
+        succeeded = self.completed_agents() & known
+        pending = {agent["name"]: agent for agent in agents if agent["name"] not in succeeded}
+        failed = set()
+        running = {}
+        slots = asyncio.Semaphore(self.max_workers)
+
+        async def run_with_slot(agent):
+            async with slots:
+                return await self.run_agent(agent["name"], agent["prompt"], agent["dependencies"],
+                                            agent.get("inputs", []), agent.get("per_advisor", False),
+                                            agent.get("context_keys"))
+
+        while pending or running:
+            # Resolve until stable: a skipped agent can unblock more skips
+            progress = True
+            while progress:
+                progress = False
+                for name, agent in list(pending.items()):
+                    deps = agent["dependencies"]
+                    if any(dep in failed for dep in deps):
+                        del pending[name]
+                        failed.add(name)
+                        self.record_failure(name, "Skipped: dependency failed")
+                        progress = True
+                    elif all(dep in succeeded for dep in deps):
+                        del pending[name]
+                        running[asyncio.create_task(run_with_slot(agent))] = name
+
+            if not running:
+                # Nothing can start: the remaining agents form a cycle
+                for name in pending:
+                    failed.add(name)
+                    self.record_failure(name, "Skipped: circular dependency")
+                break
+
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                name = running.pop(task)
+                try:
+                    result = task.result()
+                    issue = "Failed to execute"
+                except Exception as e:
+                    result = None
+                    issue = f"Failed to execute: {e}"
+
+                if result:
+                    succeeded.add(name)
+                else:
+                    failed.add(name)
+                    self.record_failure(name, issue)
+
+        return succeeded, failed
+
+    def schedule_agents(self, agents):
+        """Synchronous shim around schedule_agents_async"""
+        return asyncio.run(self.schedule_agents_async(agents))
+
     def execute_pipeline(self):
         """Execute the complete pipeline with all 14 agents"""
-        agents = [
-            {
-                "name": "advisor-data-manager",
-                "prompt": "Fetch advisor data from data/advisors.json",
-                "dependencies": []
-            },
-            {
-                "name": "market-intelligence",
-                "prompt": "Analyze market data from data/market-intelligence.json",
-                "dependencies": []
-            },
-            {
-                "name": "segment-analyzer",
-                "prompt": "Analyze advisor segments based on advisor data",
-                "dependencies": ["advisor-data-manager"]
-            },
-            {
-                "name": "linkedin-post-generator",
-                "prompt": "Generate LinkedIn posts using market data and segments",
-                "dependencies": ["market-intelligence", "segment-analyzer"]
-            },
-            {
-                "name": "whatsapp-message-creator",
-                "prompt": "Create WhatsApp messages using market insights",
-                "dependencies": ["market-intelligence", "segment-analyzer"]
-            },
-            {
-                "name": "status-image-designer",
-                "prompt": "Design WhatsApp status images",
-                "dependencies": ["market-intelligence"]
-            },
-            {
-                "name": "gemini-image-generator",
-                "prompt": "Generate images based on designs",
-                "dependencies": ["status-image-designer"]
-            },
-            {
-                "name": "brand-customizer",
-                "prompt": "Apply advisor branding to all content",
-                "dependencies": ["linkedin-post-generator", "whatsapp-message-creator", "gemini-image-generator"]
-            },
-            {
-                "name": "compliance-validator",
-                "prompt": "Validate all content for SEBI compliance",
-                "dependencies": ["linkedin-post-generator", "whatsapp-message-creator"]
-            },
-            {
-                "name": "quality-scorer",
-                "prompt": "Score content quality",
-                "dependencies": ["compliance-validator"]
-            },
-            {
-                "name": "fatigue-checker",
-                "prompt": "Check content freshness against 30-day history",
-                "dependencies": ["linkedin-post-generator", "whatsapp-message-creator"]
-            },
-            {
-                "name": "distribution-controller",
-                "prompt": "Manage content distribution",
-                "dependencies": ["compliance-validator", "quality-scorer"]
-            },
-            {
-                "name": "analytics-tracker",
-                "prompt": "Track and analyze metrics",
-                "dependencies": ["distribution-controller"]
-            },
-            {
-                "name": "feedback-processor",
-                "prompt": "Process feedback for improvements",
-                "dependencies": ["analytics-tracker"]
-            }
-        ]
-
         print(f"🚀 Starting FinAdvise Orchestration")
         print(f"📁 Session: {self.session_id}")
+        print(f"👷 Workers: {self.max_workers}")
+        completed = self.completed_agents()
+        if completed:
+            print(f"⏩ Resuming: {len(completed)} agents already completed")
         print(f"=" * 50)
 
-        # Execute each agent
-        for agent in agents:
-            result = self.execute_agent(
-                agent["name"],
-                agent["prompt"],
-                agent["dependencies"]
-            )
-
-            if not result:
-                self.session_learnings.append({
-                    "agent": agent["name"],
-                    "issue": "Failed to execute",
-                    "timestamp": datetime.now().isoformat()
-                })
-
-            # Small delay to simulate processing
-            time.sleep(0.5)
+        # Execute agents in dependency order, independent agents in parallel
+        pipeline_start = time.perf_counter()
+        failed = set()
+        try:
+            succeeded, failed = self.schedule_agents(PIPELINE_AGENTS)
+            # Any agent that did not succeed, however it was skipped, fails the session
+            failed |= {agent["name"] for agent in PIPELINE_AGENTS} - succeeded
+        except BaseException:
+            self.session_state["status"] = "FAILED"
+            self.save_session_state()
+            raise
+        finally:
+            self.flush_message_bus()
+            self.export_shared_memory()
+            self.tracer.export(self.output_dir / "trace.json", span_trace.read_spans(self.script_spans_file))
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+        self.session_state["makespan_seconds"] = round(time.perf_counter() - pipeline_start, 3)
 
         # Extract learnings
         self.extract_learnings()
 
-        # Final status
-        self.session_state["status"] = "COMPLETED"
+        # Final status: COMPLETED only when every agent succeeded, since
+        # downstream batch jobs treat COMPLETED sessions as safe to process
+        self.session_state["status"] = "FAILED" if failed else "COMPLETED"
+        self.session_state["failed_agents"] = sorted(failed)
         self.session_state["completed_at"] = datetime.now().isoformat()
         self.save_session_state()
 
-        print(f"\n✅ Orchestration Complete!")
+        if failed:
+            print(f"\n❌ Orchestration finished with {len(failed)} failed or skipped agents: {', '.join(sorted(failed))}")
+        else:
+            print(f"\n✅ Orchestration Complete!")
         print(f"📊 Agents Executed: {len(self.session_state['agents_executed'])}")
         print(f"📁 Outputs: {self.output_dir}")
 
@@ -267,7 +1220,7 @@ Save outputs to: {self.output_dir}
 
         content += f"""
 ## Communication Log
-- Messages Exchanged: {len(self.message_bus)}
+- Messages Exchanged: {self.message_count}
 - Cross-Agent References: {len(self.agent_memory.get('cross_references', []))}
 
 ## Memory Usage
@@ -292,7 +1245,29 @@ Save outputs to: {self.output_dir}
         return True
 
 if __name__ == "__main__":
-    orchestrator = FinAdviseOrchestrator()
+    parser = argparse.ArgumentParser(description="FinAdvise orchestration pipeline")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Number of agents allowed to run concurrently")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-run every agent even if its inputs are unchanged")
+    parser.add_argument("--resume", metavar="SESSION_ID",
+                        help="Resume a crashed session from its checkpoint")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help="Advisors per shard for per-advisor stages")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="CPU workers for advisor shards in this session (default: CPU count)")
+    parser.add_argument("--gemini-concurrency", type=int, default=DEFAULT_GEMINI_CONCURRENCY,
+                        help="Maximum concurrent Gemini calls in this session")
+    args = parser.parse_args()
+
+    orchestrator = FinAdviseOrchestrator(
+        max_workers=args.workers,
+        use_cache=not args.no_cache,
+        resume_session_id=args.resume,
+        shard_size=args.shard_size,
+        processes=args.processes,
+        gemini_concurrency=args.gemini_concurrency
+    )
 
     # Setup MCP (placeholder for now)
     # orchestrator.setup_mcp_server()
@@ -6,10 +6,15 @@ Processes LinkedIn posts, WhatsApp messages, and validates images
 
 import json
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 import shutil
 
+# sebi_compliance lives at the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import sebi_compliance as sebi
+
 class BrandCustomizer:
     def __init__(self, session_id):
         self.session_id = session_id
@@ -22,6 +27,7 @@ class BrandCustomizer:
             "images_validated": 0,
             "total_assets": 0,
             "compliant_assets": 0,
+            "rejected_assets": 0,
             "warnings": []
         }
 
@@ -43,6 +49,19 @@ class BrandCustomizer:
             }
         return advisor_dict
 
+    def reject_if_noncompliant(self, text, channel, name):
+        """Log and count a branded draft with CRITICAL SEBI issues; True if rejected"""
+        blocking = sebi.blocking_issues(sebi.check(text, channel, name))
+        if not blocking:
+            return False
+        self.brand_compliance_log.append(
+            f"✗ {'LinkedIn' if channel == 'linkedin' else 'WhatsApp'}: {name} - Rejected: "
+            + "; ".join(issue['issue'] for issue in blocking)
+        )
+        self.stats['rejected_assets'] += 1
+        self.stats['warnings'].append(f"{name} not written: {len(blocking)} critical SEBI issue(s)")
+        return True
+
     def enhance_linkedin_post(self, post_data, advisor_id):
         """Enhance LinkedIn post with proper brand formatting"""
         advisor = self.advisor_data[advisor_id]
@@ -94,12 +113,13 @@ class BrandCustomizer:
             lines = text.split('\n')
             cleaned_lines = []
             for line in lines:
-                if advisor['tagline'] not in line and 'ARN:' not in line:
+                if advisor['tagline'] not in line and 'ARN:' not in line and sebi.WHATSAPP_DISCLAIMER not in line:
                     cleaned_lines.append(line)
             text = '\n'.join(cleaned_lines).strip()
 
         # Apply compact WhatsApp branding (character-conscious)
         branded_text = f"{text}\n\n"
+        branded_text += f"{sebi.WHATSAPP_DISCLAIMER}\n"
         branded_text += f"{advisor['tagline']}\n"
         branded_text += f"ARN: {advisor['arn']}"
 
@@ -115,6 +135,7 @@ class BrandCustomizer:
         msg_data['brandingApplied'] = {
             'tagline': True,
             'arn': True,
+            'disclaimer': True,
             'compactFormat': True
         }
 
@@ -136,6 +157,9 @@ class BrandCustomizer:
 
             advisor_id = post_data['advisorId']
             enhanced_post = self.enhance_linkedin_post(post_data, advisor_id)
+            self.stats['linkedin_processed'] += 1
+            if self.reject_if_noncompliant(enhanced_post['content'], 'linkedin', json_file.name):
+                continue
 
             # Save branded version (both JSON and TXT)
             output_json = linkedin_branded_path / json_file.name
@@ -148,7 +172,6 @@ class BrandCustomizer:
                 f.write(enhanced_post['content'])
 
             self.brand_compliance_log.append(f"✓ LinkedIn: {json_file.name} - Branded with tagline + ARN + hashtags")
-            self.stats['linkedin_processed'] += 1
             self.stats['compliant_assets'] += 1
 
         print(f"✓ Processed {self.stats['linkedin_processed']} LinkedIn posts")
@@ -166,6 +189,9 @@ class BrandCustomizer:
 
             advisor_id = msg_data['advisorId']
             enhanced_msg = self.enhance_whatsapp_message(msg_data, advisor_id)
+            self.stats['whatsapp_processed'] += 1
+            if self.reject_if_noncompliant(enhanced_msg['text'], 'whatsapp', json_file.name):
+                continue
 
             # Save branded version (both JSON and TXT)
             output_json = whatsapp_branded_path / json_file.name
@@ -178,7 +204,6 @@ class BrandCustomizer:
                 f.write(enhanced_msg['text'])
 
             self.brand_compliance_log.append(f"✓ WhatsApp: {json_file.name} - Branded with tagline + ARN (compact)")
-            self.stats['whatsapp_processed'] += 1
             self.stats['compliant_assets'] += 1
 
         print(f"✓ Processed {self.stats['whatsapp_processed']} WhatsApp messages")
@@ -379,6 +404,7 @@ def main():
     print(f"LinkedIn posts: {customizer.stats['linkedin_processed']}")
     print(f"WhatsApp messages: {customizer.stats['whatsapp_processed']}")
     print(f"Status images: {customizer.stats['images_validated']}")
+    print(f"Rejected (SEBI): {customizer.stats['rejected_assets']}")
     print(f"\nReport: {report_path}")
 
     if customizer.stats['warnings']:
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compliance Pattern Micro-Benchmark
+Worst-case latency of the SEBI disclaimer / prohibited-phrase checks and the
+fatigue checker's currency regex on long and pathological inputs, comparing
+the old unbounded `.*` patterns with the bounded proximity rules now in
+data/sebi-compliance-rules.json.
+
+Legacy patterns stop growing their input once a single search takes longer
+than LEGACY_BUDGET seconds (they are polynomial, so larger sizes would hang).
+
+Usage: python3 scripts/benchmark-compliance-patterns.py
+"""
+
+import importlib.util
+import re
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SIZES = [2_000, 8_000, 32_000, 128_000]
+LEGACY_BUDGET = 2.0
+
+LEGACY_PATTERNS = {
+    'scheme_document': r'read.*scheme.*document|scheme.*document.*carefully',
+    'past_performance': r'past\s+performance.*not.*indicative',
+    'past_returns': r'past.*returns.*not.*guaranteed',
+    'promised_returns': r'\bpromise.*returns?',
+    'currency': r'[₹$]\s*[\d,]+(?:\.\d+)?(?:\s*(?:cr|crore|lakh|lakhs|L|K|billion|trillion))?',
+}
+
+# Repeating units that make `.*` chains backtrack without ever matching,
+# and unspaced runs of one term ("readreadread...") that a proximity match
+# could start inside at every repetition: label -> (pattern, unit)
+PATHOLOGICAL = {
+    'scheme_document': ('scheme_document', 'read scheme scheme '),
+    'past_performance': ('past_performance', 'past performance not not '),
+    'past_returns': ('past_returns', 'past returns not '),
+    'promised_returns': ('promised_returns', 'promise promise '),
+    'currency': ('currency', '$ ' + '1,' * 8 + ' '),
+    'read (unspaced)': ('scheme_document', 'read'),
+    'scheme (unspaced)': ('scheme_document', 'scheme'),
+    'past (unspaced)': ('past_returns', 'past'),
+    'promise (unspaced)': ('promised_returns', 'promise'),
+}
+
+LINKEDIN_POST = (
+    "Gold just crossed $3,955.90 while FIIs pulled ₹2.35 lakh crore out of Indian equities. "
+    "Here is what that means for your SIP and why panic selling is the costliest mistake. "
+) * 12 + (
+    "\n\nARN: ARN-125847\nMutual fund investments are subject to market risks, "
+    "read all scheme related documents carefully. Past performance is not indicative of future returns."
+)
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def current_patterns():
+    validator = load_module('sebi_validator', ROOT / 'validate-sebi-compliance.py')
+    fatigue = load_module('fatigue_checker', ROOT / 'agents' / 'fatigue-checker.py')
+    engine = validator.load_rule_engine()
+    rules = {rule['id']: rule for rule in engine.rules}
+
+    def rule_pattern(rule_id, index=0):
+        return validator.compile_rule_pattern(rules[rule_id]['patterns'][index])
+
+    return engine, {
+        'scheme_document': rule_pattern('scheme_document'),
+        'past_performance': rule_pattern('past_performance'),
+        'past_returns': rule_pattern('past_performance', 3),
+        'promised_returns': rule_pattern('promised_returns'),
+        'currency': fatigue.CURRENCY_PATTERN.pattern,
+    }
+
+
+def worst_case(pattern, text, repeats=3):
+    compiled = re.compile(pattern, re.IGNORECASE)
+    compiled.search(text[:1000])  # warm up
+    worst = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        list(compiled.finditer(text))
+        worst = max(worst, time.perf_counter() - start)
+    return worst
+
+
+def main():
+    engine, bounded = current_patterns()
+
+    post = LINKEDIN_POST
+    print(f"📊 Realistic LinkedIn post ({len(post)} chars)")
+    for name in LEGACY_PATTERNS:
+        print(f"   {name:18s} legacy {worst_case(LEGACY_PATTERNS[name], post) * 1e3:9.3f} ms"
+              f"   bounded {worst_case(bounded[name], post) * 1e3:9.3f} ms")
+
+    engine.issues(post, 'LinkedIn Post', 'benchmark')  # warm up
+    worst = 0.0
+    for _ in range(3):
+        start = time.perf_counter()
+        engine.issues(post, 'LinkedIn Post', 'benchmark')
+        worst = max(worst, time.perf_counter() - start)
+    print(f"   {'full rule engine':18s} {'':16s}   bounded {worst * 1e3:9.3f} ms")
+
+    print(f"\n🔥 Pathological inputs (worst of 3 runs)")
+    for label, (name, unit) in PATHOLOGICAL.items():
+        legacy_blown = False
+        for size in SIZES:
+            text = (unit * (size // len(unit) + 1))[:size]
+            if legacy_blown:
+                legacy = '   skipped'
+            else:
+                elapsed = worst_case(LEGACY_PATTERNS[name], text, repeats=1)
+                legacy_blown = elapsed > LEGACY_BUDGET
+                legacy = f"{elapsed * 1e3:10.1f}"
+            print(f"   {label:18s} {size:7d} chars   legacy {legacy} ms"
+                  f"   bounded {worst_case(bounded[name], text) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Fatigue Matcher Benchmark
+Compares the single-pass keyword matcher in agents/fatigue-checker.py with
+the original per-keyword substring scans on a large synthetic history, and
+checks both return the same topics, emotions and market references.
+
+Usage: python3 scripts/benchmark-fatigue-matcher.py [items]
+"""
+
+import importlib.util
+import random
+import sys
+import time
+from pathlib import Path
+
+ITEMS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+
+def load_fatigue_checker():
+    path = Path(__file__).resolve().parent.parent / 'agents' / 'fatigue-checker.py'
+    spec = importlib.util.spec_from_file_location('fatigue_checker', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_scan(fc, text):
+    """The original checks: one substring scan per keyword"""
+    topics = [topic for topic, keywords in fc.TOPIC_KEYWORDS.items()
+              if any(kw in text.lower() for kw in keywords)]
+    emotions = [emotion for emotion, words in fc.EMOTION_KEYWORDS.items()
+                if any(word in text.lower() for word in words)]
+    refs = [ref for ref in fc.MARKET_REFS if ref in text.lower()]
+    return {'topic': topics, 'emotion': emotions, 'market_ref': refs}
+
+
+def synthetic_history(fc, count):
+    rng = random.Random(7)
+    vocabulary = [kw for kws in fc.TOPIC_KEYWORDS.values() for kw in kws]
+    vocabulary += [kw for kws in fc.EMOTION_KEYWORDS.values() for kw in kws]
+    vocabulary += fc.MARKET_REFS
+    vocabulary = [kw.upper() if rng.random() < 0.2 else kw for kw in vocabulary]
+    filler = ['investors', 'returns', 'this', 'week', 'portfolios', 'wealth',
+              'planning', 'family', 'long', 'term', 'equity', 'funds', '₹5,000', '12%']
+    return [
+        ' '.join(rng.choice(vocabulary) if rng.random() < 0.15 else rng.choice(filler)
+                 for _ in range(rng.randint(40, 200)))
+        for _ in range(count)
+    ]
+
+
+def main():
+    fc = load_fatigue_checker()
+    texts = synthetic_history(fc, ITEMS)
+    print(f"📊 {len(texts)} items, {sum(len(t) for t in texts) / 1e6:.1f}M characters")
+
+    start = time.perf_counter()
+    legacy = [legacy_scan(fc, text) for text in texts]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single_pass = [fc.FATIGUE_MATCHER.scan(text) for text in texts]
+    single_pass_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, single_pass) if a != b)
+    print(f"   Per-keyword scans: {legacy_time:.3f}s")
+    print(f"   Single pass:       {single_pass_time:.3f}s ({legacy_time / single_pass_time:.1f}x)")
+    print(f"   Mismatches:        {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,16 +7,19 @@ For current orchestration session with quality control
 import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import google.generativeai as genai
 from PIL import Image, ImageDraw, ImageFont
 import time
 
-# Get session from current-session.json
-with open('data/current-session.json', 'r') as f:
-    session_info = json.load(f)
-    SESSION_ID = session_info['sessionId']
-    SESSION_DIR = session_info['sessionDir']
+# span_trace lives at the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import span_trace
+
+# Session config: output/<session>/session-config.json written by the
+# orchestrator, or the legacy data/current-session.json
+DEFAULT_SESSION_CONFIG = 'data/current-session.json'
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
@@ -27,9 +30,19 @@ if not GEMINI_API_KEY:
 
 genai.configure(api_key=GEMINI_API_KEY)
 
-def create_reference_image():
+def load_session_config(config_path):
+    """Load session ID, directory and Gemini quota for one session"""
+    with open(config_path, 'r') as f:
+        session_info = json.load(f)
+    return {
+        'session_id': session_info['sessionId'],
+        'session_dir': session_info['sessionDir'],
+        'gemini_concurrency': session_info.get('geminiConcurrency', 1)
+    }
+
+def create_reference_image(session_dir):
     """Create 1080x1920 reference image"""
-    ref_dir = Path(SESSION_DIR) / "images" / "status"
+    ref_dir = Path(session_dir) / "images" / "status"
     ref_dir.mkdir(exist_ok=True, parents=True)
     ref_path = ref_dir / "reference_1080x1920.png"
 
@@ -52,7 +65,7 @@ def create_reference_image():
     print(f"✅ Reference image created: {ref_path}")
     return ref_path
 
-def generate_image(design_spec, reference_path):
+def generate_image(design_spec, reference_path, session_dir):
     """Generate image using Gemini with design specifications"""
 
     design_id = design_spec['designId']
@@ -94,7 +107,7 @@ Generate a STUNNING professional image matching these exact specifications."""
         ])
 
         # Save generated image
-        output_dir = Path(SESSION_DIR) / "images" / "status"
+        output_dir = Path(session_dir) / "images" / "status"
         output_dir.mkdir(exist_ok=True, parents=True)
         output_path = output_dir / f"{design_id}.png"
 
@@ -117,17 +130,23 @@ Generate a STUNNING professional image matching these exact specifications."""
         print(f"   ❌ Error generating {design_id}: {str(e)}")
         return None
 
-def main():
+def main(config_path=DEFAULT_SESSION_CONFIG):
+    config = load_session_config(config_path)
+    span_trace.configure(config_path)
+    session_id = config['session_id']
+    session_dir = config['session_dir']
+
     print(f"\n{'='*60}")
     print(f"WhatsApp Status Image Generation")
-    print(f"Session: {SESSION_ID}")
+    print(f"Session: {session_id}")
+    print(f"Gemini concurrency: {config['gemini_concurrency']}")
     print(f"{'='*60}\n")
 
     # Create reference image
-    ref_path = create_reference_image()
+    ref_path = create_reference_image(session_dir)
 
     # Load design specifications
-    designs_path = Path(SESSION_DIR) / "status-image-designs.json"
+    designs_path = Path(session_dir) / "status-image-designs.json"
     if not designs_path.exists():
         print(f"❌ Design specifications not found: {designs_path}")
         sys.exit(1)
@@ -140,17 +159,27 @@ def main():
 
     # Generate images
     results = {
-        'session': SESSION_ID,
+        'session': session_id,
         'total_designs': len(designs),
         'generated': [],
         'failed': []
     }
 
-    for i, design in enumerate(designs, 1):
+    def generate_with_rate_limit(i, design):
         print(f"\n[{i}/{len(designs)}] Processing {design['designId']}...")
+        with span_trace.span("generate_image", cat="gemini", design=design['designId']):
+            output_path = generate_image(design, ref_path, session_dir)
+
+        # Rate limiting (per Gemini slot)
+        if i < len(designs):
+            time.sleep(2)
+        return output_path
 
-        output_path = generate_image(design, ref_path)
+    # At most gemini_concurrency Gemini calls in flight for this session
+    with ThreadPoolExecutor(max_workers=config['gemini_concurrency']) as pool:
+        output_paths = list(pool.map(generate_with_rate_limit, range(1, len(designs) + 1), designs))
 
+    for design, output_path in zip(designs, output_paths):
         if output_path:
             results['generated'].append({
                 'designId': design['designId'],
@@ -160,12 +189,8 @@ def main():
         else:
             results['failed'].append(design['designId'])
 
-        # Rate limiting
-        if i < len(designs):
-            time.sleep(2)
-
     # Save results
-    results_path = Path(SESSION_DIR) / "images" / "generation-results.json"
+    results_path = Path(session_dir) / "images" / "generation-results.json"
     with open(results_path, 'w') as f:
         json.dump(results, f, indent=2)
 
@@ -175,11 +200,12 @@ def main():
     print(f"{'='*60}")
     print(f"✅ Generated: {len(results['generated'])}/{len(designs)}")
     print(f"❌ Failed: {len(results['failed'])}")
-    print(f"📁 Output: {Path(SESSION_DIR) / 'images' / 'status'}")
+    print(f"📁 Output: {Path(session_dir) / 'images' / 'status'}")
     print(f"📊 Results: {results_path}")
 
     return len(results['generated']) > 0
 
 if __name__ == "__main__":
-    success = main()
+    config_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv('FINADVISE_SESSION_CONFIG', DEFAULT_SESSION_CONFIG)
+    success = main(config_path)
     sys.exit(0 if success else 1)
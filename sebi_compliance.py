@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+SEBI Compliance Check - importable entry point for content generators
+validate-sebi-compliance.py cannot be imported by name; this module loads
+it once and re-exports the in-process draft check:
+
+    import sebi_compliance
+    issues = sebi_compliance.check(text, "whatsapp", "ADV001_msg1")
+    if sebi_compliance.blocking_issues(issues): ...
+"""
+
+import importlib.util
+from pathlib import Path
+
+
+def _load_validator():
+    path = Path(__file__).resolve().parent / 'validate-sebi-compliance.py'
+    spec = importlib.util.spec_from_file_location('sebi_validator', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_validator = _load_validator()
+
+check = _validator.check
+blocking_issues = _validator.blocking_issues
+WHATSAPP_DISCLAIMER = _validator.WHATSAPP_DISCLAIMER
+WHATSAPP_CHAR_LIMIT = _validator.WHATSAPP_CHAR_LIMIT
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Session Status - how batch tools tell a running session from a finished one
+The SEBI validator's batch mode and the fatigue checker's history sync both
+skip sessions an orchestrator is still writing:
+
+    from session_status import session_is_live
+    if not session_is_live(session_path): ...
+"""
+
+import json
+import os
+import time
+
+# A session whose state is not terminal and was saved this recently is
+# assumed to still be running
+LIVE_SESSION_GRACE_SECONDS = 3600
+
+# Statuses the orchestrator writes last; nothing runs after them
+TERMINAL_STATUSES = frozenset({'COMPLETED', 'FAILED'})
+
+
+def session_is_live(session_path):
+    """True if an orchestrator is probably still writing this session"""
+    state_file = os.path.join(session_path, 'session_state.json')
+    try:
+        with open(state_file, 'r') as f:
+            status = json.load(f).get('status')
+        age = time.time() - os.stat(state_file).st_mtime
+    except (OSError, ValueError):
+        return False
+    return status not in TERMINAL_STATUSES and age < LIVE_SESSION_GRACE_SECONDS
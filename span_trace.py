@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Span Trace - timing spans for standalone scripts and pool workers
+Spans are appended as Chrome-trace "X" events, one JSON object per line, to
+the trace file named by the session config ("traceFile"); the orchestrator
+merges them into the session's trace.json. Until configure() is given a
+trace file, span() only runs the enclosed block:
+
+    import span_trace
+    span_trace.configure(session_config_path)
+    with span_trace.span("generate_image", cat="gemini", image=name):
+        ...
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, spans report no RSS
+    resource = None
+
+_trace_file = None
+
+
+def configure(session_config):
+    """Write spans to the trace file of a session config (a dict or a path to one)"""
+    global _trace_file
+    if session_config is not None and not isinstance(session_config, dict):
+        try:
+            with open(session_config, 'r') as f:
+                session_config = json.load(f)
+        except (OSError, ValueError):
+            session_config = None
+    _trace_file = (session_config or {}).get('traceFile')
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KB on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@contextmanager
+def span(name, cat="script", **args):
+    """Time the enclosed block and append it to the configured trace file"""
+    trace_file = _trace_file
+    if trace_file is None:
+        yield args
+        return
+
+    start_ts = time.time()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield args
+    finally:
+        wall_ms = (time.perf_counter() - start_wall) * 1000
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(start_ts * 1_000_000),
+            "dur": round(wall_ms * 1000),
+            "pid": os.getpid(),
+            # Main-thread spans share tid 0, so they nest inside the worker's shard span
+            "tid": 0 if threading.current_thread() is threading.main_thread() else threading.get_native_id(),
+            "args": dict(args,
+                         wall_ms=round(wall_ms, 3),
+                         process_cpu_ms=round((time.process_time() - start_cpu) * 1000, 3),
+                         process_peak_rss_kb=_peak_rss_kb())
+        }
+        # One short append per span, so concurrent writers do not interleave lines
+        with open(trace_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event) + "\n")
+
+
+def read_spans(trace_file):
+    """Events appended to a trace file, skipping a torn last line"""
+    events = []
+    try:
+        with open(trace_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return events
@@ -4,16 +4,363 @@ SEBI Compliance Validator for FinAdvise Content
 Validates LinkedIn posts, WhatsApp messages, and images for regulatory compliance
 """
 
+import argparse
+import contextlib
+import fnmatch
+import hashlib
 import json
 import re
 import os
+import sqlite3
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+import sys
+
+# span_trace lives next to this script, which is also loaded by path from scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import span_trace
+from session_status import session_is_live
+
+# Private to re; only used for the optional first-character prefilter
+try:
+    from re import _parser as sre_parse, _constants as sre_constants  # Python 3.11+
+except ImportError:
+    try:
+        import sre_parse
+        import sre_constants
+    except ImportError:
+        sre_parse = sre_constants = None
+
+RULESET_PATH = Path(__file__).resolve().parent / "data" / "sebi-compliance-rules.json"
+OUTPUT_ROOT = "/Users/shriyavallabh/Desktop/mvp/output"
+VERDICT_CACHE_PATH = Path(__file__).resolve().parent / "data" / "compliance-verdicts.db"
+BATCH_INDEX_NAME = "compliance-index.json"
+
+
+def atomic_write_json(path, data):
+    """Write JSON via a temp file and rename, so readers never see a torn file"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def proximity_pattern(terms, within):
+    """Regex for terms in order, at most `within` words apart.
+
+    Every term must start a word. Words and separators are disjoint
+    character classes, so every gap is matched in O(within) steps, and the
+    leading \\b lets a match start only once per word, so a scan stays
+    linear in the text length even on long unspaced runs ("readreadread...")
+    (unlike `.*` chains, which backtrack polynomially on long posts).
+    """
+    gap = rf"\w*(?:\W+\w+){{0,{within}}}?\W+"
+    return gap.join(rf"\b(?:{term})" for term in terms)
+
+
+def compile_rule_pattern(pattern):
+    """Regex source for a ruleset pattern: a regex string or {"near": [...], "within": N}"""
+    if isinstance(pattern, dict):
+        return "|".join(
+            proximity_pattern(terms, pattern["within"])
+            for terms in (pattern["near"] if isinstance(pattern["near"][0], list) else [pattern["near"]])
+        )
+    return pattern
+
+
+def _first_chars(items):
+    """Character-class items one of which starts every match of a parsed
+    regex sequence, or None when a match could start anywhere or be empty"""
+    chars = set()
+    for op, av in items:
+        if op is sre_constants.AT:
+            continue
+        if op is sre_constants.LITERAL:
+            chars.add(re.escape(chr(av)))
+            return chars
+        if op is sre_constants.IN:
+            for item_op, item_av in av:
+                if item_op is sre_constants.LITERAL:
+                    chars.add(re.escape(chr(item_av)))
+                elif item_op is sre_constants.RANGE:
+                    chars.add(f"{re.escape(chr(item_av[0]))}-{re.escape(chr(item_av[1]))}")
+                elif item_op is sre_constants.CATEGORY and item_av is sre_constants.CATEGORY_DIGIT:
+                    chars.add(r"\d")
+                else:
+                    return None
+            return chars
+        if op is sre_constants.SUBPATTERN:
+            sub = _first_chars(av[-1])
+        elif op is sre_constants.BRANCH:
+            subs = [_first_chars(branch) for branch in av[1]]
+            sub = None if None in subs else set().union(*subs)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            sub = _first_chars(av[2])
+            if sub is not None and av[0] == 0:
+                chars |= sub  # optional: the match may start after it
+                continue
+        else:
+            return None
+        if sub is None:
+            return None
+        return chars | sub
+    return None
+
+
+def first_char_class(patterns):
+    """Character class of every character a match of any pattern can start
+    with, or None to scan without a prefilter.
+
+    The class comes from re's private parser, which may change between
+    Python versions; any failure to read it just skips the prefilter.
+    """
+    if sre_parse is None:
+        return None
+    try:
+        first = [_first_chars(sre_parse.parse(pattern)) for pattern in patterns]
+        if None in first:
+            return None
+        char_class = "[" + "".join(sorted(set().union(*first))) + "]"
+        re.compile(char_class)
+    except Exception:
+        return None
+    return char_class
+
+
+class ComplianceRuleEngine:
+    """Compiled SEBI ruleset that finds every rule hit in one pass.
+
+    All rule patterns are combined into one regex: a character class of
+    every possible first character (so the scan skips other positions),
+    a lookahead gate that only stops where some pattern matches, and one
+    optional lookahead capture per pattern. Lookaheads keep overlapping hits from
+    different rules, and hits are filtered to each pattern's own
+    non-overlapping matches, so results equal a separate finditer per
+    pattern.
+    """
+
+    def __init__(self, ruleset):
+        self.version = ruleset["version"]
+        self.rules = ruleset["rules"]
+        self.pattern_rules = []  # pattern index -> rule id
+        patterns = []
+        for rule in self.rules:
+            for pattern in map(compile_rule_pattern, rule["patterns"]):
+                re.compile(pattern)  # fail on a bad rule before combining
+                patterns.append(pattern)
+                self.pattern_rules.append(rule["id"])
+        # Changes with any edit to the rules or to how they compile, even without a version bump
+        digest = hashlib.sha256(json.dumps([ruleset, patterns], sort_keys=True).encode('utf-8')).hexdigest()
+        self.fingerprint = f"{self.version}:{digest[:16]}"
+
+        gate = "(?=" + "|".join(f"(?:{pattern})" for pattern in patterns) + ")"
+        first = first_char_class(patterns)
+        if first is not None:
+            gate = f"(?={first})" + gate
+        captures = "".join(f"(?:(?=(?P<p{i}>{pattern})))?" for i, pattern in enumerate(patterns))
+        self.matcher = re.compile(gate + captures, re.IGNORECASE)
+        self.groups = [self.matcher.groupindex[f"p{i}"] for i in range(len(patterns))]
+
+    def scan(self, content):
+        """{rule id: [(start, end), ...]} for every rule with a hit"""
+        hits = {}
+        next_start = [0] * len(self.groups)
+        for match in self.matcher.finditer(content):
+            for i, group in enumerate(self.groups):
+                start, end = match.span(group)
+                if start >= 0 and start >= next_start[i]:
+                    next_start[i] = end
+                    hits.setdefault(self.pattern_rules[i], []).append((start, end))
+        for spans in hits.values():
+            spans.sort()
+        return hits
+
+    def issues(self, content, content_type, identifier, groups=None, hits=None):
+        """Issues for one document, in ruleset order (hits: a cached scan)"""
+        if hits is None:
+            hits = self.scan(content)
+        issues = []
+        for rule in self.rules:
+            if groups is not None and rule["group"] not in groups:
+                continue
+            issue = {
+                "type": rule["type"],
+                "category": rule["category"],
+                "issue": rule["issue"],
+                "content_id": identifier,
+                "content_type": content_type
+            }
+            if rule["check"] == "require":
+                if rule["id"] not in hits:
+                    if "suggestion" in rule:
+                        issue["suggestion"] = rule["suggestion"]
+                    issues.append(issue)
+            else:
+                for start, end in hits.get(rule["id"], []):
+                    # Get context around the match
+                    context = content[max(0, start - 30):min(len(content), end + 30)].replace('\n', ' ')
+                    issues.append(dict(issue, snippet=f"...{context}...", severity=rule["severity"]))
+        return issues
+
+
+def normalize_text(content):
+    """Canonical form validated and cached: NFC, LF line endings, no trailing whitespace"""
+    content = unicodedata.normalize("NFC", content).replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in content.split("\n")).strip()
+
+
+class VerdictCache:
+    """Persistent rule hits per normalized text, keyed by content hash.
+
+    Rows carry the ruleset fingerprint, and opening the cache deletes every
+    row from another ruleset in one statement, so a rule change invalidates
+    all verdicts at once. A stale process never reads them either, since
+    lookups also match on the fingerprint.
+    """
+
+    FLUSH_EVERY = 200
+
+    def __init__(self, engine, db_path=VERDICT_CACHE_PATH):
+        self.engine = engine
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS verdicts (
+                    text_hash TEXT NOT NULL,
+                    ruleset TEXT NOT NULL,
+                    hits TEXT NOT NULL,
+                    PRIMARY KEY (text_hash, ruleset)
+                )
+            """)
+            self.conn.execute('DELETE FROM verdicts WHERE ruleset != ?', (engine.fingerprint,))
+        self.memory = {}
+        self.pending = []
+        self.hits = 0
+        self.misses = 0
+
+    def scan(self, content):
+        """Rule hits for normalized content, from the cache or a fresh scan"""
+        key = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        hits = self.memory.get(key)
+        if hits is None:
+            row = self.conn.execute(
+                'SELECT hits FROM verdicts WHERE text_hash = ? AND ruleset = ?',
+                (key, self.engine.fingerprint)
+            ).fetchone()
+            if row:
+                hits = {rule_id: [tuple(span) for span in spans] for rule_id, spans in json.loads(row[0]).items()}
+        if hits is None:
+            self.misses += 1
+            hits = self.engine.scan(content)
+            self.pending.append((key, self.engine.fingerprint, json.dumps(hits)))
+            if len(self.pending) >= self.FLUSH_EVERY:
+                self.flush()
+        else:
+            self.hits += 1
+        self.memory[key] = hits
+        return hits
+
+    def flush(self):
+        """Persist verdicts computed since the last flush"""
+        if not self.pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO verdicts (text_hash, ruleset, hits) VALUES (?, ?, ?)',
+                self.pending
+            )
+        self.pending = []
+
+
+@lru_cache(maxsize=None)
+def load_rule_engine(ruleset_path=RULESET_PATH):
+    """Compile a ruleset file once per process"""
+    with open(ruleset_path, 'r', encoding='utf-8') as f:
+        return ComplianceRuleEngine(json.load(f))
+
+
+CHANNEL_CONTENT_TYPES = {"linkedin": "LinkedIn Post", "whatsapp": "WhatsApp Message"}
+WHATSAPP_CHAR_LIMIT = 400
+
+# Shortest wording that satisfies the market-risk and scheme-document rules,
+# for messages that must stay within WHATSAPP_CHAR_LIMIT
+WHATSAPP_DISCLAIMER = "MFs are subject to market risks, read scheme documents carefully."
+
+
+def whatsapp_format_issues(content, identifier):
+    """WhatsApp-specific validation: character limit"""
+    if len(content) <= WHATSAPP_CHAR_LIMIT:
+        return []
+    return [{
+        "type": "WARNING",
+        "category": "WhatsApp Format",
+        "issue": f"Message exceeds optimal {WHATSAPP_CHAR_LIMIT} character limit ({len(content)} chars)",
+        "content_id": identifier,
+        "content_type": "WhatsApp Message"
+    }]
+
+
+@lru_cache(maxsize=4096)
+def _draft_scan(text, ruleset_path):
+    # Generators re-check the same draft after each edit pass; never mutate the result
+    content = normalize_text(text)
+    return content, load_rule_engine(ruleset_path).scan(content)
+
+
+def draft_text(content):
+    """Plain text of a draft; some generated JSON stores content as a dict or list of parts.
+
+    Parts are joined by newlines rather than JSON-encoded, since escaped
+    newlines ("\\nPast performance") would glue words together.
+    """
+    if isinstance(content, dict):
+        content = list(content.values())
+    if isinstance(content, list):
+        return "\n".join(filter(None, map(draft_text, content)))
+    if content is None:
+        return ""
+    return content if isinstance(content, str) else str(content)
+
+
+def check(text, channel="linkedin", identifier=None, ruleset_path=RULESET_PATH):
+    """Issues for one draft, in-process, without a session on disk.
+
+    Same issues a session run reports for the text (channel: 'linkedin' or
+    'whatsapp'). The ruleset compiles once per process and scans are
+    memoized per draft text, so generators can gate every draft before
+    writing it.
+    """
+    if channel not in CHANNEL_CONTENT_TYPES:
+        raise ValueError(f"Unknown channel {channel!r}, expected one of {sorted(CHANNEL_CONTENT_TYPES)}")
+    text = draft_text(text)
+    with span_trace.span("sebi.check", cat="compliance", channel=channel, content_id=identifier):
+        content, hits = _draft_scan(text, ruleset_path)
+        issues = load_rule_engine(ruleset_path).issues(content, CHANNEL_CONTENT_TYPES[channel], identifier, hits=hits)
+        if channel == "whatsapp":
+            issues += whatsapp_format_issues(text, identifier)
+    return issues
+
+
+def blocking_issues(issues):
+    """The CRITICAL issues that stop a draft from being published"""
+    return [issue for issue in issues if issue["type"] == "CRITICAL"]
+
 
 class SEBIComplianceValidator:
-    def __init__(self, session_id):
+    def __init__(self, session_id, ruleset_path=RULESET_PATH, output_root=OUTPUT_ROOT, use_cache=True):
         self.session_id = session_id
-        self.base_path = f"/Users/shriyavallabh/Desktop/mvp/output/{session_id}"
+        self.base_path = f"{output_root}/{session_id}"
+        self.rules = load_rule_engine(ruleset_path)
+        # Re-runs only scan new or changed text
+        self.verdicts = VerdictCache(self.rules) if use_cache else None
         self.issues = []
         self.validation_results = {
             "session_id": session_id,
@@ -25,102 +372,27 @@ class SEBIComplianceValidator:
             "detailed_findings": []
         }
 
-    def validate_arn_disclosure(self, content, content_type, identifier):
-        """Check for valid ARN disclosure"""
-        issues = []
+    def check_rules(self, content, content_type, identifier, groups=None):
+        """Issues for the normalized content, using cached verdicts when available"""
+        content = normalize_text(content)
+        hits = self.verdicts.scan(content) if self.verdicts else None
+        return self.rules.issues(content, content_type, identifier, groups, hits)
 
-        # Check ARN format (ARN-XXXXXX)
-        arn_pattern = r'ARN[:\-\s]*\d{6}'
-        if not re.search(arn_pattern, content, re.IGNORECASE):
-            issues.append({
-                "type": "CRITICAL",
-                "category": "ARN Disclosure",
-                "issue": "Missing ARN number in required format (ARN-XXXXXX)",
-                "content_id": identifier,
-                "content_type": content_type
-            })
+    def validate_content(self, content, content_type, identifier):
+        """Run every ruleset check on one document in a single pass"""
+        return self.check_rules(content, content_type, identifier)
 
-        return issues
+    def validate_arn_disclosure(self, content, content_type, identifier):
+        """Check for valid ARN disclosure"""
+        return self.check_rules(content, content_type, identifier, groups={"arn"})
 
     def validate_risk_disclaimers(self, content, content_type, identifier):
         """Check for mandatory risk disclaimers"""
-        issues = []
-
-        # Required disclaimers
-        required_phrases = [
-            (r'market\s+risk', "Market risk disclaimer"),
-            (r'read.*scheme.*document|scheme.*document.*carefully', "Scheme document warning"),
-        ]
-
-        for pattern, description in required_phrases:
-            if not re.search(pattern, content, re.IGNORECASE):
-                issues.append({
-                    "type": "CRITICAL",
-                    "category": "Risk Disclaimer",
-                    "issue": f"Missing required disclaimer: {description}",
-                    "content_id": identifier,
-                    "content_type": content_type
-                })
-
-        # Check for past performance disclaimer (more lenient)
-        past_perf_patterns = [
-            r'past\s+performance.*not.*indicative',
-            r'past\s+performance.*not.*sustained',
-            r'past\s+performance.*may\s+not',
-            r'past.*returns.*not.*guaranteed'
-        ]
-
-        has_past_perf_disclaimer = any(
-            re.search(pattern, content, re.IGNORECASE)
-            for pattern in past_perf_patterns
-        )
-
-        if not has_past_perf_disclaimer:
-            issues.append({
-                "type": "MAJOR",
-                "category": "Risk Disclaimer",
-                "issue": "Missing past performance disclaimer",
-                "content_id": identifier,
-                "content_type": content_type,
-                "suggestion": "Add: 'Past performance is not indicative of future returns'"
-            })
-
-        return issues
+        return self.check_rules(content, content_type, identifier, groups={"disclaimer"})
 
     def validate_prohibited_language(self, content, content_type, identifier):
         """Check for prohibited/misleading language"""
-        issues = []
-
-        prohibited_terms = [
-            (r'\bguaranteed\s+returns?\b', "Guaranteed returns"),
-            (r'\bassured\s+profit', "Assured profits"),
-            (r'\brisk[:\-\s]*free', "Risk-free claim"),
-            (r'\bzero\s+risk', "Zero risk claim"),
-            (r'\b\d+%\s+guaranteed', "Specific return guarantee"),
-            (r'\bcertain\s+returns?', "Certain returns"),
-            (r'\bpromise.*returns?', "Promise of returns"),
-            (r'\bno\s+loss', "No loss claim")
-        ]
-
-        for pattern, description in prohibited_terms:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                # Get context around the match
-                start = max(0, match.start() - 30)
-                end = min(len(content), match.end() + 30)
-                context = content[start:end].replace('\n', ' ')
-
-                issues.append({
-                    "type": "CRITICAL",
-                    "category": "Prohibited Language",
-                    "issue": f"Prohibited term found: {description}",
-                    "content_id": identifier,
-                    "content_type": content_type,
-                    "snippet": f"...{context}...",
-                    "severity": "BLOCKING - Content cannot be published"
-                })
-
-        return issues
+        return self.check_rules(content, content_type, identifier, groups={"prohibited"})
 
     def validate_linkedin_posts(self):
         """Validate all LinkedIn posts"""
@@ -144,10 +416,7 @@ class SEBIComplianceValidator:
                         content = f.read()
 
                     # Run all validations
-                    post_issues = []
-                    post_issues.extend(self.validate_arn_disclosure(content, "LinkedIn Post", post_id))
-                    post_issues.extend(self.validate_risk_disclaimers(content, "LinkedIn Post", post_id))
-                    post_issues.extend(self.validate_prohibited_language(content, "LinkedIn Post", post_id))
+                    post_issues = self.validate_content(content, "LinkedIn Post", post_id)
 
                     if post_issues:
                         self.validation_results['linkedin_posts']['issues'].extend(post_issues)
@@ -184,25 +453,13 @@ class SEBIComplianceValidator:
                 content = message['message_text']
 
                 # Run all validations
-                msg_issues = []
-                msg_issues.extend(self.validate_arn_disclosure(content, "WhatsApp Message", msg_id))
-                msg_issues.extend(self.validate_risk_disclaimers(content, "WhatsApp Message", msg_id))
-                msg_issues.extend(self.validate_prohibited_language(content, "WhatsApp Message", msg_id))
-
-                # WhatsApp-specific validation: Character limit
-                if len(content) > 400:
-                    msg_issues.append({
-                        "type": "WARNING",
-                        "category": "WhatsApp Format",
-                        "issue": f"Message exceeds optimal 400 character limit ({len(content)} chars)",
-                        "content_id": msg_id,
-                        "content_type": "WhatsApp Message"
-                    })
+                msg_issues = self.validate_content(content, "WhatsApp Message", msg_id)
+                msg_issues += whatsapp_format_issues(content, msg_id)
 
                 if msg_issues:
                     self.validation_results['whatsapp_messages']['issues'].extend(msg_issues)
                     # Only count as failed if critical issues
-                    if any(issue['type'] == 'CRITICAL' for issue in msg_issues):
+                    if blocking_issues(msg_issues):
                         self.validation_results['whatsapp_messages']['failed'] += 1
                     else:
                         passed_messages += 1
@@ -302,14 +559,20 @@ class SEBIComplianceValidator:
         self.validation_results['total_content_items'] = total_content
         self.validation_results['total_passed'] = total_passed
         self.validation_results['critical_issues_count'] = len(critical_issues)
+        self.validation_results['ruleset_version'] = self.rules.version
+        if self.verdicts:
+            self.verdicts.flush()
+            self.validation_results['verdict_cache'] = {
+                "hits": self.verdicts.hits,
+                "misses": self.verdicts.misses
+            }
 
         # Save report
         report_dir = f"{self.base_path}/reports"
         os.makedirs(report_dir, exist_ok=True)
 
         report_path = f"{report_dir}/compliance-validation.json"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(self.validation_results, f, indent=2, ensure_ascii=False)
+        atomic_write_json(report_path, self.validation_results)
 
         print(f"\n{'='*60}")
         print(f"SEBI COMPLIANCE VALIDATION REPORT")
@@ -318,6 +581,8 @@ class SEBIComplianceValidator:
         print(f"Status: {self.validation_results['overall_status']}")
         print(f"Compliance Score: {compliance_score:.1f}%")
         print(f"Critical Issues: {len(critical_issues)}")
+        if self.verdicts:
+            print(f"Verdict Cache: {self.verdicts.hits} cached, {self.verdicts.misses} validated")
         print(f"\nContent Summary:")
         print(f"  LinkedIn Posts: {self.validation_results['linkedin_posts']['passed']}/{self.validation_results['linkedin_posts']['total']} passed")
         print(f"  WhatsApp Messages: {self.validation_results['whatsapp_messages']['passed']}/{self.validation_results['whatsapp_messages']['total']} passed")
@@ -336,10 +601,94 @@ class SEBIComplianceValidator:
 
         return self.validation_results
 
-def main():
-    session_id = "session_20251002_180551"
+def validate_session(session_id, output_root=OUTPUT_ROOT, ruleset_path=RULESET_PATH, use_cache=True):
+    """Process-pool worker: validate one session quietly and summarise it"""
+    validator = SEBIComplianceValidator(session_id, ruleset_path, output_root, use_cache)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        validator.validate_linkedin_posts()
+        validator.validate_whatsapp_messages()
+        validator.validate_images()
+        results = validator.generate_compliance_report()
+    return {
+        "session_id": session_id,
+        "overall_status": results["overall_status"],
+        "compliance_score": results["compliance_score"],
+        "critical_issues_count": results["critical_issues_count"],
+        "total_content_items": results["total_content_items"],
+        "validation_errors": sum(
+            1 for category in ("linkedin_posts", "whatsapp_messages", "images")
+            for issue in results[category]["issues"] if issue.get("type") == "ERROR"
+        ),
+        "report": f"{session_id}/reports/compliance-validation.json"
+    }
+
+
+def validate_sessions(pattern, workers=None, output_root=OUTPUT_ROOT, ruleset_path=RULESET_PATH,
+                      include_live=False, use_cache=True):
+    """Validate every session directory matching a glob; write a consolidated index"""
+    matched = sorted(
+        name for name in os.listdir(output_root)
+        if fnmatch.fnmatch(name, pattern) and os.path.isdir(os.path.join(output_root, name))
+    )
+    live = [] if include_live else [
+        name for name in matched if session_is_live(os.path.join(output_root, name))
+    ]
+    sessions = [name for name in matched if name not in live]
+
+    print(f"Validating {len(sessions)} sessions matching '{pattern}'"
+          f" ({len(live)} live sessions skipped)...\n")
+
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            session_id: pool.submit(validate_session, session_id, output_root, ruleset_path, use_cache)
+            for session_id in sessions
+        }
+        for session_id in sessions:
+            try:
+                summary = futures[session_id].result()
+            except Exception as e:
+                summary = {"session_id": session_id, "overall_status": "ERROR", "error": str(e)}
+            summaries.append(summary)
+            print(f"  {summary['overall_status']:5s} {session_id}"
+                  + (f"  ({summary['compliance_score']:.1f}%)" if 'compliance_score' in summary else ""))
+
+    index = {
+        "generated_at": datetime.now().isoformat(),
+        "pattern": pattern,
+        "ruleset_version": load_rule_engine(ruleset_path).version,
+        "sessions_validated": len(summaries),
+        "sessions_failed": sum(1 for summary in summaries if summary["overall_status"] != "PASS"),
+        "skipped_live_sessions": live,
+        "sessions": summaries
+    }
+    index_path = os.path.join(output_root, BATCH_INDEX_NAME)
+    atomic_write_json(index_path, index)
+    print(f"\nIndex saved to: {index_path}")
+    return index
 
-    validator = SEBIComplianceValidator(session_id)
+
+def main():
+    parser = argparse.ArgumentParser(description="SEBI compliance validation for FinAdvise sessions")
+    parser.add_argument("session_id", nargs="?", default="session_20251002_180551",
+                        help="Session to validate (default: %(default)s)")
+    parser.add_argument("--sessions", metavar="GLOB",
+                        help="Validate every session in output/ matching GLOB, e.g. 'session_*'")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes for --sessions (default: CPU count)")
+    parser.add_argument("--include-live", action="store_true",
+                        help="Also validate sessions an orchestrator may still be writing")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-validate every item even if its text was validated before")
+    args = parser.parse_args()
+
+    if args.sessions:
+        return validate_sessions(args.sessions, args.workers, include_live=args.include_live,
+                                 use_cache=not args.no_cache)
+
+    session_id = args.session_id
+
+    validator = SEBIComplianceValidator(session_id, use_cache=not args.no_cache)
 
     print("Starting SEBI Compliance Validation...\n")
 